@@ -1,15 +1,17 @@
 from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QGridLayout, QLineEdit, QPushButton, QMessageBox, QLabel, QSpinBox, QDoubleSpinBox, QCheckBox
-from src.analysis.benchmark.benchmark_worker import BenchmarkWorker
-from src.analysis.benchmark.benchmark_visualization import BenchmarkVisualization
 from src.base.base_tab import BaseTab
 import os
 
 class BenchmarkSubTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.visualization = BenchmarkVisualization()
         self.init_ui()
 
+    def create_visualization(self):
+        # Matplotlib and NumPy load with the plots the first time they are needed, not at application startup
+        from src.analysis.benchmark.benchmark_visualization import BenchmarkVisualization
+        return BenchmarkVisualization()
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
         self.setup_subtab(
@@ -18,7 +20,7 @@ class BenchmarkSubTab(BaseTab):
             "Benchmark Progress",
             "Benchmark Logs",
             "Benchmark Visualization",
-            self.visualization,
+            self.create_visualization,
             {
                 "start_text": "Start Benchmark",
                 "stop_text": "Stop Benchmark",
@@ -127,7 +129,7 @@ class BenchmarkSubTab(BaseTab):
         self.progress_bar.setValue(0)
         self.progress_bar.setFormat("Starting Benchmark...")
         self.remaining_time_label.setText("Time Left: Calculating...")
-        self.visualization.reset_visualization()
+        self.reset_visualization()
         self.benchmark_group.setVisible(False)
         self.progress_group.setVisible(True)
         self.log_group.setVisible(True)
@@ -140,6 +142,7 @@ class BenchmarkSubTab(BaseTab):
         if self.start_new_button:
             self.start_new_button.setVisible(False)
         self.init_ui_state = False
+        from src.analysis.benchmark.benchmark_worker import BenchmarkWorker
         started = self.start_worker(
             BenchmarkWorker,
             bot1_path,
@@ -226,7 +229,7 @@ class BenchmarkSubTab(BaseTab):
         self.progress_bar.setFormat("Idle")
         self.remaining_time_label.setText("Time Left: N/A")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
         if self.start_button:
             self.start_button.setEnabled(True)
         if self.stop_button:
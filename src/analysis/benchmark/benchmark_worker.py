@@ -1,27 +1,50 @@
 from PyQt5.QtCore import pyqtSignal
 import os
 import time
+import signal
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import chess
 import chess.pgn
+import chess.polyglot
 import json
+import numpy as np
 import torch
+import torch.multiprocessing as mp
+from multiprocessing.util import Finalize
 from typing import Dict, Optional, Tuple
 from src.base.base_worker import BaseWorker
-from src.training.reinforcement.mcts import MCTS
-from src.utils.chess_utils import get_total_moves, convert_board_to_tensor, get_move_mapping
+from src.training.reinforcement.mcts import BatchedMCTS
+from src.utils.chess_utils import BOARD_ENCODING_VERSION, get_total_moves, convert_board_to_tensor, get_move_mapping, update_piece_planes, encode_feature_planes
 from src.utils.common_utils import wait_if_paused, update_progress_time_left, get_game_result
+from src.utils.inference_server import InferenceServer
+from src.utils.logger import Logger, QueueLogSignal
+from src.utils.train_utils import preserve_backend_flags
 from src.models.model import ChessModel
 
-class Bot:
-    def __init__(self, path: str, use_mcts: bool, use_opening_book: bool, logger):
+# Games played concurrently against the shared GPU models; enough to fill the inference batches
+CUDA_GAME_THREADS = 8
+
+class BotModel:
+    # Model and inference server shared by every game played with one bot, so their requests batch together
+    def __init__(self, path: str, logger, wait_ms: float = InferenceServer.WAIT_MS):
         self.path = path
-        self.use_mcts = use_mcts
-        self.use_opening_book = use_opening_book
         self.logger = logger
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.eager_model: Optional[ChessModel] = None
         self.model = self._load_model()
-        self.mcts: Optional[MCTS] = None
-        self.initialize_mcts()
+        self.inference_server: Optional[InferenceServer] = None
+        if self.model:
+            self.inference_server = InferenceServer(self.model, torch.device(self.device), wait_ms=wait_ms)
+            self.inference_server.start()
+            if self.model is not self.eager_model:
+                self._warm_up_server()
+
+    def close(self):
+        if self.inference_server is not None:
+            self.inference_server.stop()
+            self.inference_server = None
 
     def _load_model(self) -> Optional[ChessModel]:
         if not os.path.exists(self.path):
@@ -32,61 +55,87 @@ class Bot:
             model = ChessModel(get_total_moves()).to(self.device)
             checkpoint = torch.load(self.path, map_location=self.device)
             model.load_state_dict(checkpoint["model_state_dict"])
-            model.eval()
+            if checkpoint.get("board_encoding_version", 1) != BOARD_ENCODING_VERSION:
+                self.logger.warning(f"{self.path} was trained on board encoding version {checkpoint.get('board_encoding_version', 1)}, inputs now use version {BOARD_ENCODING_VERSION}.")
+            model.eval().fuse_for_inference()
+            if self.device == "cuda":
+                # Benchmark inference is latency-bound, so halve the bytes moved per forward
+                # and let the convolutions use NHWC Tensor Core kernels
+                model.half()
+                model.to(memory_format=torch.channels_last)
+                self.eager_model = model
+                model = self._compile_model(model)
+            else:
+                model = model.quantize_for_cpu()
+                self.eager_model = model
             self.logger.info(f"Loaded model from {self.path}")
             return model
         except Exception as e:
             self.logger.error(f"Failed to load model from {self.path}: {e}")
             return None
 
-    def initialize_mcts(self, simulations: int = 100, exploration: float = 1.4):
-        if self.use_mcts and self.model:
-            self.mcts = MCTS(model=self.model, device=torch.device(self.device), c_puct=exploration, n_simulations=simulations)
-            self.logger.info("Initialized MCTS for bot.")
-
-    def _get_board_action_probs(self, board: chess.Board) -> Dict[chess.Move, float]:
-        if not self.model:
-            return {}
-
-        board_tensor = convert_board_to_tensor(board)
-        board_tensor = torch.from_numpy(board_tensor).float().unsqueeze(0).to(self.device)
-
-        with torch.no_grad():
-            policy_logits, _ = self.model(board_tensor)
-            policy_logits = policy_logits[0]  # Remove batch dimension
-
-        # Convert logits to probabilities
-        policy = torch.softmax(policy_logits, dim=0).cpu().numpy()
+    def _compile_model(self, model: ChessModel):
+        # The server runs every batch size up to its maximum, so compile with a dynamic batch
+        # dimension and without CUDA graphs, which would be recorded per size and per thread
+        try:
+            return torch.compile(model, dynamic=True)
+        except Exception as e:
+            self.logger.warning(f"torch.compile failed, using eager model: {e}")
+            return model
 
-        legal_moves = list(board.legal_moves)
-        if not legal_moves:
-            return {}
+    def _warm_up_server(self):
+        # Compilation is lazy, so trigger it on the server thread before the first game for both
+        # graphs the server needs: a single request and a (dynamic) multi-request batch
+        dummy = np.zeros((25, 8, 8), dtype=np.float32)
+        try:
+            self.inference_server.infer(dummy)
+            for future in [self.inference_server.submit(dummy) for _ in range(self.inference_server.max_batch)]:
+                future.result()
+        except Exception as e:
+            self.logger.warning(f"torch.compile failed, using eager model: {e}")
+            self.model = self.eager_model
+            self.inference_server.model = self.eager_model
 
-        action_probs = {}
-        total_prob = 0.0
-        move_mapping = get_move_mapping()
+class Bot:
+    def __init__(self, bot_model: BotModel, use_mcts: bool, use_opening_book: bool, logger):
+        self.use_mcts = use_mcts
+        self.use_opening_book = use_opening_book
+        self.logger = logger
+        self.device = bot_model.device
+        self.model = bot_model.model
+        self.inference_server = bot_model.inference_server
+        self.move_mapping = get_move_mapping()
+        self.move_to_idx = self.move_mapping.INDEX_MAPPING
+        self.mcts_batch_size = 64
+        # Scratch input planes reused for every move; the inference server copies them into its pinned batch buffer
+        self.board_planes = np.empty((25, 8, 8), dtype=np.float32)
+        # Game board and ply the scratch piece planes currently describe
+        self.planes_board: Optional[chess.Board] = None
+        self.planes_ply = 0
+        self.mcts: Optional[BatchedMCTS] = None
+        self.initialize_mcts()
 
-        for move in legal_moves:
-            idx = move_mapping.get_index_by_move(move)
-            if idx is not None and idx < len(policy):
-                prob = max(policy[idx], 1e-8)
-                action_probs[move] = prob
-                total_prob += prob
-            else:
-                action_probs[move] = 1e-8
-                total_prob += 1e-8
+    def initialize_mcts(self, simulations: int = 100, exploration: float = 1.4):
+        if self.use_mcts and self.model:
+            self.mcts = BatchedMCTS(model=self.model, device=torch.device(self.device), c_puct=exploration, n_simulations=simulations, inference_server=self.inference_server)
+            self.logger.info("Initialized MCTS for bot.")
 
-        # Normalize probabilities
-        if total_prob > 0:
-            for mv in action_probs:
-                action_probs[mv] /= total_prob
+    def _get_legal_move_indices(self, legal_moves) -> np.ndarray:
+        # Policy index per legal move, -1 for moves outside the mapping
+        return np.fromiter((self.move_to_idx.get(move, -1) for move in legal_moves), dtype=np.int64, count=len(legal_moves))
+
+    def _encode_board(self, board: chess.Board) -> np.ndarray:
+        # Within one game only the moves played since this bot's last turn touch the piece planes
+        ply = len(board.move_stack)
+        if board is self.planes_board and self.planes_ply <= ply:
+            for move in board.move_stack[self.planes_ply:]:
+                update_piece_planes(self.board_planes, move)
+            encode_feature_planes(board, self.board_planes)
         else:
-            # Fallback to uniform if total_prob is zero
-            uniform_prob = 1.0 / len(legal_moves)
-            for mv in action_probs:
-                action_probs[mv] = uniform_prob
-
-        return action_probs
+            convert_board_to_tensor(board, out=self.board_planes)
+        self.planes_board = board
+        self.planes_ply = ply
+        return self.board_planes
 
     def get_move_pth(self, board: chess.Board) -> chess.Move:
         if not self.model:
@@ -99,14 +148,18 @@ class Bot:
                 self.logger.warning("No legal moves available.")
                 return chess.Move.null()
 
-            action_probs = self._get_board_action_probs(board)
-            if not action_probs:
-                self.logger.warning("No valid moves found from the NN inference.")
-                return chess.Move.null()
+            board_tensor = self._encode_board(board)
+            policy_logits, _ = self.inference_server.infer(board_tensor)
 
-            # Pick move with the highest probability
-            best_move = max(action_probs, key=action_probs.get)
-            return best_move
+            # Softmax is monotonic, so the best move is the argmax of the legal logits
+            idxs = self._get_legal_move_indices(legal_moves)
+            mapped = np.flatnonzero(idxs >= 0)
+            if mapped.size == 0:
+                return legal_moves[0]
+
+            legal_idx = torch.from_numpy(idxs[mapped]).to(policy_logits.device)
+            best_local = policy_logits[legal_idx].argmax().item()
+            return legal_moves[mapped[best_local]]
 
         except Exception as e:
             self.logger.error(f"Error determining move with .pth model: {e}")
@@ -117,13 +170,13 @@ class Bot:
             self.logger.warning("MCTS not initialized. Returning null move.")
             return chess.Move.null()
 
-        self.mcts.set_root_node(board.copy())
+        self.mcts.set_root_node(board)
 
-        start_time = time.time()
-        while (time.time() - start_time) < time_per_move:
-            if board.is_game_over():
-                break
-            self.mcts.simulate()
+        # Each step selects, expands and evaluates a whole batch of leaves at once
+        deadline = time.time() + time_per_move
+        if not board.is_game_over():
+            while time.time() < deadline:
+                self.mcts.simulate_batch(batch_size=self.mcts_batch_size)
 
         move_probs = self.mcts.get_move_probs(temperature=1e-3)
         if not move_probs:
@@ -134,7 +187,7 @@ class Bot:
         best_move = max(move_probs, key=move_probs.get)
         return best_move
 
-    def get_move(self, board: chess.Board, time_per_move: float, opening_book: Dict[str, Dict[str, Dict[str, int]]]) -> chess.Move:
+    def get_move(self, board: chess.Board, time_per_move: float, opening_book: Optional[np.ndarray]) -> chess.Move:
         # Use opening book and MCTS if both are enabled
         if self.use_mcts and self.use_opening_book:
             move = self.get_opening_book_move(board, opening_book)
@@ -153,37 +206,131 @@ class Bot:
         # Fallback to model-based move
         return self.get_move_pth(board)
 
-    def get_opening_book_move(self, board: chess.Board, opening_book: Dict[str, Dict[str, Dict[str, int]]]) -> chess.Move:
-        if not opening_book:
+    def get_opening_book_move(self, board: chess.Board, opening_book: Optional[np.ndarray]) -> chess.Move:
+        if opening_book is None or opening_book.shape[1] == 0:
             return chess.Move.null()
 
-        fen = board.fen()
-        moves_data = opening_book.get(fen, {})
-        best_move: Optional[chess.Move] = None
-        best_score = -1.0
-
-        # Iterate through possible moves from the opening book
-        for uci_move, stats in moves_data.items():
-            if not isinstance(stats, dict):
-                self.logger.error(f"Invalid stats for move {uci_move}: {stats}")
-                continue
+        # Rows are sorted by Zobrist key, so a position's entries are one contiguous slice
+        keys = opening_book[0]
+        key = np.uint64(chess.polyglot.zobrist_hash(board))
+        lo = np.searchsorted(keys, key, side="left")
+        hi = np.searchsorted(keys, key, side="right")
+        if lo == hi:
+            return chess.Move.null()
 
-            total = stats.get("win", 0) + stats.get("draw", 0) + stats.get("loss", 0)
-            if total == 0:
-                continue
+        # Score every book move for this position in one pass
+        _, packed_moves, wins, draws, losses = opening_book[:, lo:hi]
+        totals = wins + draws + losses
+        scores = np.where(totals > 0, (wins + 0.5 * draws) / np.maximum(totals, 1), -1.0)
 
-            # Calculate score based on wins and draws
-            score = (stats.get("win", 0) + 0.5 * stats.get("draw", 0)) / total
-            try:
-                move_candidate = chess.Move.from_uci(uci_move)
-                if move_candidate in board.legal_moves and score > best_score:
-                    best_score = score
-                    best_move = move_candidate
-            except ValueError as e:
-                self.logger.error(f"Error parsing move {uci_move}: {e}")
+        # Entries that aren't legal here (e.g. hash collisions) are never picked; checking only the
+        # book moves avoids generating every legal move of the position
+        legal_moves = board.legal_moves
+        moves = [unpack_book_move(packed_move) for packed_move in packed_moves.tolist()]
+        scores[~np.fromiter((move in legal_moves for move in moves), dtype=bool, count=len(moves))] = -1.0
 
         # Return the best move found or a null move if none
-        return best_move if best_move else chess.Move.null()
+        best = int(scores.argmax())
+        return moves[best] if scores[best] >= 0 else chess.Move.null()
+
+def pack_book_move(move: chess.Move) -> int:
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+def unpack_book_move(packed_move: int) -> chess.Move:
+    return chess.Move(packed_move & 63, (packed_move >> 6) & 63, promotion=(packed_move >> 12) or None)
+
+# Per-process state for benchmark game processes, set up once by the pool initializer
+_game_process = {}
+
+def _create_game_state(bot1_config: Tuple[str, bool, bool], bot2_config: Tuple[str, bool, bool], opening_book_path: Optional[str], time_per_move: float, stop_event, pause_event, logger, wait_ms: float = InferenceServer.WAIT_MS) -> dict:
+    # Both bots share one model and server when they play the same network
+    bot1_model = BotModel(bot1_config[0], logger, wait_ms)
+    bot2_model = bot1_model if bot2_config[0] == bot1_config[0] else BotModel(bot2_config[0], logger, wait_ms)
+    return {
+        "bot1_model": bot1_model,
+        "bot2_model": bot2_model,
+        "bot1_flags": bot1_config[1:],
+        "bot2_flags": bot2_config[1:],
+        # Memory-mapped so all game processes share the book through the page cache
+        "opening_book": np.load(opening_book_path, mmap_mode="r") if opening_book_path else None,
+        "time_per_move": time_per_move,
+        "stop_event": stop_event,
+        "pause_event": pause_event,
+        "logger": logger,
+    }
+
+def _close_game_state(state: dict):
+    for bot_model in {state["bot1_model"], state["bot2_model"]}:
+        bot_model.close()
+
+def _init_game_process(bot1_config: Tuple[str, bool, bool], bot2_config: Tuple[str, bool, bool], opening_book_path: Optional[str], time_per_move: float, stop_event, pause_event, log_queue, num_processes: int):
+    # Game processes run side by side, so each gets its share of the cores instead of all of them
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // num_processes))
+    logger = Logger(log_signal=QueueLogSignal(log_queue), level="DEBUG")
+    # A game process plays one game at a time, so no other game's requests can join a batch; dispatch without waiting
+    _game_process.update(_create_game_state(bot1_config, bot2_config, opening_book_path, time_per_move, stop_event, pause_event, logger, wait_ms=0))
+    # Stop the inference servers when the process exits, also when the pool terminates it
+    Finalize(None, _close_game_state, args=(_game_process,), exitpriority=10)
+    signal.signal(signal.SIGTERM, _terminate_game_process)
+
+def _terminate_game_process(signum, frame):
+    # Exit without unwinding through the pool's task loop or running its atexit handlers
+    _close_game_state(_game_process)
+    os._exit(0)
+
+def _play_single_game_entry(game_idx: int) -> Tuple[int, float, int, str]:
+    return _play_game(_game_process, game_idx)
+
+def _play_game(state: dict, game_idx: int) -> Tuple[int, float, int, str]:
+    wait_if_paused(state["pause_event"])
+    if state["stop_event"].is_set():
+        return game_idx, 0.0, 0, ""
+
+    state["logger"].info(f"Starting game {game_idx}...")
+    # Search trees and scratch planes are per game; the models and servers behind them are shared
+    bot1 = Bot(state["bot1_model"], *state["bot1_flags"], logger=state["logger"])
+    bot2 = Bot(state["bot2_model"], *state["bot2_flags"], logger=state["logger"])
+    result, moves_count, game = _play_single_game(bot1, bot2, state["opening_book"], state["time_per_move"], state["stop_event"], state["pause_event"], state["logger"])
+    return game_idx, result, moves_count, str(game)
+
+def _play_single_game(bot1: Bot, bot2: Bot, opening_book: Optional[np.ndarray], time_per_move: float, stop_event, pause_event, logger) -> Tuple[float, int, chess.pgn.Game]:
+    board = chess.Board()
+    moves_count = 0
+    game = chess.pgn.Game()
+    game.headers["Event"] = "Bot Benchmarking"
+    game.headers["Site"] = "Local"
+    game.headers["Date"] = time.strftime("%Y.%m.%d")
+    game.headers["Round"] = "-"
+    game.headers["White"] = "Bot1"
+    game.headers["Black"] = "Bot2"
+    game.headers["Result"] = "*"
+
+    node = game
+
+    while not board.is_game_over() and not stop_event.is_set():
+        # Handle pause functionality
+        wait_if_paused(pause_event)
+        # Determine which bot's turn it is
+        current_bot = bot1 if board.turn == chess.WHITE else bot2
+        # Get the move from the current bot
+        move = current_bot.get_move(board, time_per_move, opening_book)
+        if move == chess.Move.null():
+            logger.warning(f"{'Bot1' if board.turn == chess.WHITE else 'Bot2'} returned a null move.")
+            break
+        board.push(move)
+        node = node.add_variation(move)
+        moves_count += 1
+
+    # Get the game result
+    result = get_game_result(board)
+    if result > 0:
+        game.headers["Result"] = "1-0"
+    elif result < 0:
+        game.headers["Result"] = "0-1"
+    else:
+        game.headers["Result"] = "1/2-1/2"
+
+    return result, moves_count, game
 
 class BenchmarkWorker(BaseWorker):
     benchmark_update = pyqtSignal(dict)
@@ -193,84 +340,177 @@ class BenchmarkWorker(BaseWorker):
         self.num_games = num_games
         self.time_per_move = time_per_move
         self.default_mcts_simulations = 100
+        self.num_processes = max(min(num_games, os.cpu_count() or 1), 1)
 
-        # Initialize bots with their respective configurations
-        self.bot1 = Bot(path=bot1_path, use_mcts=bot1_use_mcts, use_opening_book=bot1_use_opening_book, logger=self.logger)
-        self.bot2 = Bot(path=bot2_path, use_mcts=bot2_use_mcts, use_opening_book=bot2_use_opening_book, logger=self.logger)
+        # Bots are built inside the game threads or processes from these configurations
+        self.bot1_config = (bot1_path, bot1_use_mcts, bot1_use_opening_book)
+        self.bot2_config = (bot2_path, bot2_use_mcts, bot2_use_opening_book)
 
-        # Load the opening book
-        self.opening_book = self._load_opening_book()
+        # Build or reuse the binary opening book
+        self.opening_book_path = self._load_opening_book()
 
         # Ensure the benchmark games directory exists
         self.games_dir = os.path.join("data", "games", "benchmark")
         os.makedirs(self.games_dir, exist_ok=True)
 
-    def _load_opening_book(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        # PGN files are written in the background so results keep flowing
+        self.write_pool = ThreadPoolExecutor(max_workers=1)
+
+    def _load_opening_book(self) -> Optional[str]:
         path = os.path.join("data", "processed", "opening_book.json")
+        book_path = os.path.join("data", "processed", "opening_book.npy")
         if not os.path.exists(path):
             self.logger.warning(f"Opening book not found at {path}. Continuing without it.")
-            return {}
+            return None
+
+        # The binary book is rebuilt only when the JSON book is newer
+        if os.path.exists(book_path) and os.path.getmtime(book_path) >= os.path.getmtime(path):
+            self.logger.info("Loaded opening book.")
+            return book_path
 
         try:
             with open(path, "r", encoding="utf-8") as f:
-                opening_book = json.load(f)
+                raw_book = json.load(f)
+
+            # Key positions by Zobrist hash so lookups don't serialize the board every ply.
+            # FENs that differ only in move clocks collapse onto one key, so merge their stats.
+            merged = {}
+            for fen, moves in raw_book.items():
+                key = chess.polyglot.zobrist_hash(chess.Board(fen))
+                for uci_move, stats in moves.items():
+                    if not isinstance(stats, dict):
+                        self.logger.error(f"Invalid stats for move {uci_move}: {stats}")
+                        continue
+                    try:
+                        packed_move = pack_book_move(chess.Move.from_uci(uci_move))
+                    except ValueError as e:
+                        self.logger.error(f"Error parsing move {uci_move}: {e}")
+                        continue
+                    counts = merged.setdefault((key, packed_move), [0, 0, 0])
+                    for i, outcome in enumerate(("win", "draw", "loss")):
+                        counts[i] += stats.get(outcome, 0)
+
+            # One column per book entry: key, packed move, wins, draws, losses; sorted by key
+            opening_book = np.array([(key, packed_move, *counts) for (key, packed_move), counts in merged.items()], dtype=np.uint64).reshape(-1, 5).T
+            opening_book = np.ascontiguousarray(opening_book[:, np.argsort(opening_book[0], kind="stable")])
+            np.save(book_path, opening_book)
+
             self.logger.info("Loaded opening book.")
-            return opening_book
+            return book_path
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to decode opening book JSON: {e}")
-            return {}
+            return None
         except Exception as e:
             self.logger.error(f"Unexpected error loading opening book: {e}")
-            return {}
+            return None
 
     def run_task(self):
-        # Validate that both bots are properly initialized
+        # Validate that both bots are properly configured
         if not self._validate_bots():
             return
 
         start_time = time.time()
         results = []
 
-        # Iterate through the number of games to be played
-        for game_idx in range(1, self.num_games + 1):
-            if self._is_stopped.is_set():
-                self.logger.info("Benchmarking stopped by user.")
-                return
+        # On CUDA one process owns the GPU and plays the games as threads, so all games batch
+        # through one server per model instead of each process loading its own copy
+        games = self._play_games_in_threads() if torch.cuda.is_available() else self._play_games_in_processes()
+        try:
+            # Games finish out of order; PGNs are written here as each one completes
+            for completed, (game_idx, game_result, moves_count, pgn_str) in enumerate(games, 1):
+                if self._is_stopped.is_set():
+                    self.logger.info("Benchmarking stopped by user.")
+                    return
+
+                # Save the PGN game to a file
+                self.write_pool.submit(self._write_pgn, game_idx, pgn_str)
+
+                # Determine the winner based on the game result
+                winner = self._determine_winner(game_result)
+                results.append({"game_index": game_idx, "winner": winner, "moves": moves_count})
+
+                self.logger.info(f"Game {game_idx} completed in {moves_count} moves. Winner: {winner}")
+                # Update progress and estimated time left
+                update_progress_time_left(self.progress_update, self.time_left_update, start_time, completed, self.num_games)
+        finally:
+            games.close()
+            self.write_pool.shutdown(wait=True)
 
-            # Handle pause functionality
-            wait_if_paused(self._is_paused)
-            board = chess.Board()
+        # Aggregate and emit the final statistics
+        final_stats = self._aggregate_results(results)
+        self.benchmark_update.emit(final_stats)
+        self.logger.info("Benchmarking completed.")
 
-            self.logger.info(f"Starting game {game_idx} of {self.num_games}...")
-            
-            # Play the game and get the result, move count, and PGN game
-            game_result, moves_count, pgn_game = self._play_single_game(board)
+    def _play_games_in_threads(self):
+        # The backend flags are process-wide, so they are only changed for the duration of the benchmark
+        with preserve_backend_flags():
+            # Input shapes repeat every move, so autotune the convolutions once and allow TF32
+            torch.backends.cudnn.benchmark = True
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
 
-            # Save the PGN game to a file
-            pgn_filename = os.path.join(self.games_dir, f"game_{game_idx}.pgn")
+            state = _create_game_state(self.bot1_config, self.bot2_config, self.opening_book_path, self.time_per_move, self._is_stopped, self._is_paused, self.logger)
+            executor = ThreadPoolExecutor(max_workers=min(self.num_games, CUDA_GAME_THREADS))
             try:
-                with open(pgn_filename, "w", encoding="utf-8") as pgn_file:
-                    pgn_file.write(str(pgn_game))
-                self.logger.info(f"Saved game {game_idx} to {pgn_filename}")
-            except Exception as e:
-                self.logger.error(f"Failed to save PGN for game {game_idx}: {e}")
-
-            # Determine the winner based on the game result
-            winner = self._determine_winner(game_result)
-            results.append({"game_index": game_idx, "winner": winner, "moves": moves_count})
+                futures = [executor.submit(_play_game, state, game_idx) for game_idx in range(1, self.num_games + 1)]
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+                _close_game_state(state)
+
+    def _play_games_in_processes(self):
+        # Spawned (not forked) so each game process loads its own CPU models cleanly
+        ctx = mp.get_context("spawn")
+        manager = ctx.Manager()
+        stop_event = manager.Event()
+        pause_event = manager.Event()
+        pause_event.set()
+        log_queue = manager.Queue()
+
+        relay_done = threading.Event()
+        relay = threading.Thread(target=self._relay_game_processes, args=(stop_event, pause_event, log_queue, relay_done), daemon=True)
+        relay.start()
 
-            self.logger.info(f"Game {game_idx} completed in {moves_count} moves. Winner: {winner}")
-            # Update progress and estimated time left
-            update_progress_time_left(self.progress_update, self.time_left_update, start_time, game_idx, self.num_games)
+        try:
+            initargs = (self.bot1_config, self.bot2_config, self.opening_book_path, self.time_per_move, stop_event, pause_event, log_queue, self.num_processes)
+            with ctx.Pool(processes=self.num_processes, initializer=_init_game_process, initargs=initargs) as pool:
+                yield from pool.imap_unordered(_play_single_game_entry, range(1, self.num_games + 1))
+        finally:
+            relay_done.set()
+            relay.join()
+            manager.shutdown()
+
+    def _write_pgn(self, game_idx: int, pgn_str: str):
+        pgn_filename = os.path.join(self.games_dir, f"game_{game_idx}.pgn")
+        try:
+            with open(pgn_filename, "w", encoding="utf-8") as pgn_file:
+                pgn_file.write(pgn_str)
+            self.logger.info(f"Saved game {game_idx} to {pgn_filename}")
+        except Exception as e:
+            self.logger.error(f"Failed to save PGN for game {game_idx}: {e}")
 
-        # Aggregate and emit the final statistics
-        final_stats = self._aggregate_results(results)
-        self.benchmark_update.emit(final_stats)
-        self.logger.info("Benchmarking completed.")
+    def _relay_game_processes(self, stop_event, pause_event, log_queue, done: threading.Event):
+        # Mirror stop/pause into the game processes and forward their logs to the UI
+        while True:
+            finished = done.wait(0.1)
+            if self._is_stopped.is_set():
+                stop_event.set()
+            if self._is_paused.is_set():
+                pause_event.set()
+            else:
+                pause_event.clear()
+            while not log_queue.empty():
+                level, message = log_queue.get()
+                self.log_update.emit(level, message)
+            if finished:
+                break
 
     def _validate_bots(self) -> bool:
-        bot1_valid = self.bot1.model or self.bot1.use_opening_book or self.bot1.use_mcts
-        bot2_valid = self.bot2.model or self.bot2.use_opening_book or self.bot2.use_mcts
+        bot1_path, bot1_use_mcts, bot1_use_opening_book = self.bot1_config
+        bot2_path, bot2_use_mcts, bot2_use_opening_book = self.bot2_config
+        bot1_valid = os.path.exists(bot1_path) or bot1_use_opening_book or bot1_use_mcts
+        bot2_valid = os.path.exists(bot2_path) or bot2_use_opening_book or bot2_use_mcts
 
         if not bot1_valid:
             self.logger.error("Bot1 is not properly configured.")
@@ -288,47 +528,10 @@ class BenchmarkWorker(BaseWorker):
         return "Draw"
 
     def _aggregate_results(self, results: list) -> Dict[str, int]:
+        winners = Counter(r["winner"] for r in results)
         return {
-            "bot1_wins": sum(r["winner"] == "Bot1" for r in results),
-            "bot2_wins": sum(r["winner"] == "Bot2" for r in results),
-            "draws": sum(r["winner"] == "Draw" for r in results),
+            "bot1_wins": winners["Bot1"],
+            "bot2_wins": winners["Bot2"],
+            "draws": winners["Draw"],
             "total_games": self.num_games,
-        }
-
-    def _play_single_game(self, board: chess.Board) -> Tuple[int, int, chess.pgn.Game]:
-        moves_count = 0
-        game = chess.pgn.Game()
-        game.headers["Event"] = "Bot Benchmarking"
-        game.headers["Site"] = "Local"
-        game.headers["Date"] = time.strftime("%Y.%m.%d")
-        game.headers["Round"] = "-"
-        game.headers["White"] = "Bot1"
-        game.headers["Black"] = "Bot2"
-        game.headers["Result"] = "*"
-
-        node = game
-
-        while not board.is_game_over() and not self._is_stopped.is_set():
-            # Handle pause functionality
-            wait_if_paused(self._is_paused)
-            # Determine which bot's turn it is
-            current_bot = self.bot1 if board.turn == chess.WHITE else self.bot2
-            # Get the move from the current bot
-            move = current_bot.get_move(board, self.time_per_move, self.opening_book)
-            if move == chess.Move.null():
-                self.logger.warning(f"{'Bot1' if board.turn == chess.WHITE else 'Bot2'} returned a null move.")
-                break
-            board.push(move)
-            node = node.add_variation(move)
-            moves_count += 1
-
-        # Get the game result
-        result = get_game_result(board)
-        if result > 0:
-            game.headers["Result"] = "1-0"
-        elif result < 0:
-            game.headers["Result"] = "0-1"
-        else:
-            game.headers["Result"] = "1/2-1/2"
-
-        return result, moves_count, game
\ No newline at end of file
+        }
\ No newline at end of file
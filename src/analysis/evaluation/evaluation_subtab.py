@@ -1,15 +1,17 @@
 from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QGridLayout, QLineEdit, QPushButton, QMessageBox, QLabel
-from src.analysis.evaluation.evaluation_worker import EvaluationWorker
-from src.analysis.evaluation.evaluation_visualization import EvaluationVisualization
 from src.base.base_tab import BaseTab
 import os
 
 class EvaluationSubTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.visualization = EvaluationVisualization()
         self.init_ui()
 
+    def create_visualization(self):
+        # Matplotlib and NumPy load with the plots the first time they are needed, not at application startup
+        from src.analysis.evaluation.evaluation_visualization import EvaluationVisualization
+        return EvaluationVisualization()
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
         self.setup_subtab(
@@ -18,7 +20,7 @@ class EvaluationSubTab(BaseTab):
             "Evaluation Progress",
             "Evaluation Logs",
             "Evaluation Visualization",
-            self.visualization,
+            self.create_visualization,
             {
                 "start_text": "Start Evaluation",
                 "stop_text": "Stop Evaluation",
@@ -110,6 +112,7 @@ class EvaluationSubTab(BaseTab):
         if self.start_new_button:
             self.start_new_button.setVisible(False)
         self.init_ui_state = False
+        from src.analysis.evaluation.evaluation_worker import EvaluationWorker
         started = self.start_worker(EvaluationWorker, model_path, indices_path, h5_path)
         if started:
             self.worker.metrics_update.connect(self.visualization.update_metrics_visualization)
@@ -172,7 +175,7 @@ class EvaluationSubTab(BaseTab):
         self.progress_bar.setFormat("Idle")
         self.remaining_time_label.setText("Time Left: N/A")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
         if self.start_button:
             self.start_button.setEnabled(True)
         if self.stop_button:
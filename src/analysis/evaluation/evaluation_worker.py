@@ -1,17 +1,17 @@
 import os
 import time
 from typing import Optional, List, Dict
-from collections import Counter
 import numpy as np
 import torch
+from torch.amp import autocast
 from torch.utils.data import DataLoader
 from PyQt5.QtCore import pyqtSignal
 from src.base.base_worker import BaseWorker
 from src.models.model import ChessModel
 from src.utils.datasets import H5Dataset
 from src.utils.common_utils import update_progress_time_left, wait_if_paused
-from src.utils.train_utils import initialize_random_seeds
-from src.utils.chess_utils import get_total_moves, get_move_mapping
+from src.utils.train_utils import initialize_random_seeds, preserve_backend_flags, CUDAPrefetcher
+from src.utils.chess_utils import BOARD_ENCODING_VERSION, get_total_moves, get_move_mapping
 
 class EvaluationWorker(BaseWorker):
     metrics_update = pyqtSignal(float, float, dict, dict, np.ndarray, list)
@@ -23,9 +23,16 @@ class EvaluationWorker(BaseWorker):
         self.h5_file_path = h5_file_path
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.random_seed = 42
-        self.move_mapping = get_move_mapping()
+        self.batch_size = 1024
+        move_mapping = get_move_mapping()
+        self.uci_by_index = [move_mapping.get_move_by_index(idx).uci() for idx in range(move_mapping.TOTAL_MOVES)]
 
     def run_task(self):
+        # Seeding and the CUDA tuning below change process-wide flags; restore them once evaluation ends
+        with preserve_backend_flags():
+            self._evaluate()
+
+    def _evaluate(self):
         self.logger.info("Starting evaluation worker.")
         initialize_random_seeds(self.random_seed)
 
@@ -39,11 +46,17 @@ class EvaluationWorker(BaseWorker):
             self.logger.error("Dataset loading failed. Aborting evaluation.")
             return
 
-        loader = DataLoader(dataset, batch_size=1024, shuffle=False, num_workers=0, pin_memory=True)
+        # Worker processes decode HDF5 chunks ahead of the forward passes; each opens its own file handle lazily
+        num_workers = min(8, os.cpu_count() or 1)
+        # Prefetching and keeping workers alive only apply when batches come from worker processes
+        worker_kwargs = {"persistent_workers": True, "prefetch_factor": 4} if num_workers > 0 else {}
+        loader = DataLoader(dataset, batch_size=self.batch_size, shuffle=False, num_workers=num_workers, pin_memory=True, **worker_kwargs)
 
-        all_predictions: List[int] = []
-        all_actuals: List[int] = []
-        topk_predictions: List[np.ndarray] = []
+        # Results are written into preallocated buffers and copied back once, so no batch waits on a device sync
+        num_samples = len(dataset)
+        topk_predictions = torch.empty((num_samples, 5), dtype=torch.int64, device=self.device)
+        all_actuals = np.empty(num_samples, dtype=np.int64)
+        offset = 0
 
         total_batches = len(loader)
         done_steps = 0
@@ -52,23 +65,24 @@ class EvaluationWorker(BaseWorker):
 
         self.logger.info("Evaluating model on dataset.")
 
-        for _, (inputs, policy_targets, _) in enumerate(loader, 1):
+        # Inputs arrive already on the device; the targets are only needed on the CPU for the metrics
+        for inputs, policy_targets, _ in CUDAPrefetcher(loader, self.device):
             if self._is_stopped.is_set():
                 self.logger.info("Evaluation stopped by user.")
                 return
 
             wait_if_paused(self._is_paused)
 
-            inputs = inputs.to(self.device, non_blocking=True)
-            policy_targets = policy_targets.to(self.device, non_blocking=True)
-
-            with torch.no_grad():
-                policy_outputs, _ = model(inputs)
-                _, preds = torch.max(policy_outputs, 1)
-                all_predictions.extend(preds.cpu().numpy())
-                all_actuals.extend(policy_targets.cpu().numpy())
+            # Only the ranking of the policy logits is used, so half precision is plenty
+            with torch.no_grad(), autocast("cuda", dtype=torch.float16, enabled=(self.device.type == "cuda")):
+                policy_outputs, _ = model(inputs.contiguous(memory_format=torch.channels_last))
+                # The top-1 prediction is the first column of the top-5, so one reduction covers both
                 _, topk_preds = torch.topk(policy_outputs, 5, dim=1)
-                topk_predictions.extend(topk_preds.cpu().numpy())
+
+            batch_end = offset + len(topk_preds)
+            topk_predictions[offset:batch_end] = topk_preds
+            all_actuals[offset:batch_end] = policy_targets.numpy()
+            offset = batch_end
 
             done_steps += 1
 
@@ -77,7 +91,8 @@ class EvaluationWorker(BaseWorker):
         del dataset
         torch.cuda.empty_cache()
 
-        self._compute_metrics(all_predictions, all_actuals, topk_predictions)
+        topk_predictions = topk_predictions.cpu().numpy()
+        self._compute_metrics(topk_predictions[:, 0], all_actuals, topk_predictions)
 
     def _load_model(self) -> Optional[ChessModel]:
         try:
@@ -89,6 +104,8 @@ class EvaluationWorker(BaseWorker):
 
         if isinstance(checkpoint, dict):
             state_dict = checkpoint.get("model_state_dict", checkpoint)
+            if checkpoint.get("board_encoding_version", 1) != BOARD_ENCODING_VERSION:
+                self.logger.warning(f"{self.model_path} was trained on board encoding version {checkpoint.get('board_encoding_version', 1)}, inputs now use version {BOARD_ENCODING_VERSION}.")
         else:
             state_dict = checkpoint
             self.logger.warning("Checkpoint does not contain architecture parameters. Using default settings.")
@@ -97,13 +114,34 @@ class EvaluationWorker(BaseWorker):
             model = ChessModel(num_moves=get_total_moves())
             model.load_state_dict(state_dict)
             model.to(self.device)
-            model.eval()
+            model.eval().fuse_for_inference()
             self.logger.info("Model loaded and set to evaluation mode.")
-            return model
         except Exception as e:
             self.logger.error(f"Failed to load state_dict into model: {str(e)}")
             return None
 
+        if self.device.type == "cuda":
+            # Evaluation shapes are fixed, so autotune the convolutions once, use NHWC Tensor Core kernels and allow TF32
+            model.to(memory_format=torch.channels_last)
+            torch.backends.cudnn.benchmark = True
+            torch.set_float32_matmul_precision("high")
+            model = self._compile_model(model)
+        return model
+
+    def _compile_model(self, model: ChessModel):
+        try:
+            compiled = torch.compile(model, mode="reduce-overhead")
+            # Compile and capture the CUDA graph on a full-size batch under the same autocast as the loop,
+            # so it stays out of the timed loop; only the shorter tail batch compiles again
+            dummy = torch.zeros((self.batch_size, 25, 8, 8), device=self.device).contiguous(memory_format=torch.channels_last)
+            with torch.no_grad(), autocast("cuda", dtype=torch.float16):
+                compiled(dummy)
+            self.logger.info("Model compiled with torch.compile.")
+            return compiled
+        except Exception as e:
+            self.logger.warning(f"torch.compile failed, using eager model: {e}")
+            return model
+
     def _load_dataset(self) -> Optional[H5Dataset]:
         if not os.path.exists(self.h5_file_path):
             self.logger.error(f"Dataset file not found at {self.h5_file_path}.")
@@ -113,7 +151,7 @@ class EvaluationWorker(BaseWorker):
             return None
 
         try:
-            idxs = np.load(self.dataset_indices_path)
+            idxs = np.load(self.dataset_indices_path, mmap_mode="r")
             dataset = H5Dataset(self.h5_file_path, idxs)
             self.logger.info(f"Loaded dataset indices from {self.dataset_indices_path}")
             return dataset
@@ -121,102 +159,81 @@ class EvaluationWorker(BaseWorker):
             self.logger.error(f"Failed to load dataset: {str(e)}")
             return None
 
-    def _compute_metrics(self, all_predictions: List[int], all_actuals: List[int], topk_predictions: List[np.ndarray],):
-        all_predictions = np.array(all_predictions)
-        all_actuals = np.array(all_actuals)
-        topk_predictions = np.array(topk_predictions)
-
+    def _compute_metrics(self, all_predictions: np.ndarray, all_actuals: np.ndarray, topk_predictions: np.ndarray):
         # Compute Accuracy
         accuracy = np.mean(all_predictions == all_actuals)
         self.logger.info(f"Accuracy: {accuracy * 100:.2f}%")
 
         # Compute Top-5 Accuracy
-        topk_correct = 0
-        for actual, preds in zip(all_actuals, topk_predictions):
-            if actual in preds:
-                topk_correct += 1
-        topk_accuracy = topk_correct / len(all_actuals)
+        topk_accuracy = np.mean((topk_predictions == all_actuals[:, None]).any(axis=1))
         self.logger.info(f"Top-5 Accuracy: {topk_accuracy * 100:.2f}%")
 
         # Compute Confusion Matrix and Classification Report for Top N Classes
         N = 10
-        class_counts = Counter(all_actuals)
-        common_classes = [item[0] for item in class_counts.most_common(N)]
+        class_counts = np.bincount(all_actuals)
+        most_common = np.argpartition(-class_counts, N)[:N] if len(class_counts) > N else np.arange(len(class_counts))
+        most_common = most_common[np.argsort(-class_counts[most_common], kind='stable')]
+        most_common = most_common[class_counts[most_common] > 0]
+        common_classes = most_common.tolist()
         indices = np.isin(all_actuals, common_classes)
         filtered_actuals = all_actuals[indices]
         filtered_predictions = all_predictions[indices]
 
         confusion_matrix = self._compute_confusion_matrix(filtered_actuals, filtered_predictions, common_classes)
-        classification_report = self._compute_classification_report(filtered_actuals, filtered_predictions, common_classes)
+        classification_report = self._compute_classification_report(confusion_matrix, class_counts[most_common], common_classes)
 
         # Prepare labels for reporting
-        labels = []
-        for idx in common_classes:
-            move_obj = self.move_mapping.get_move_by_index(idx)
-            if move_obj:
-                labels.append(move_obj.uci())
-            else:
-                labels.append(f"Unknown({idx})")
+        labels = [self.uci_by_index[idx] if idx < len(self.uci_by_index) else f"Unknown({idx})" for idx in common_classes]
 
         if self.metrics_update:
             self.metrics_update.emit(accuracy, topk_accuracy, classification_report.get('macro avg', {}), classification_report.get('weighted avg', {}), confusion_matrix, labels)
 
     def _compute_confusion_matrix(self, actuals: np.ndarray, predictions: np.ndarray, labels: List[int]) -> np.ndarray:
-        label_to_idx = {label: i for i, label in enumerate(labels)}
-        matrix = np.zeros((len(labels), len(labels)), dtype=int)
-        for actual, pred in zip(actuals, predictions):
-            if actual in label_to_idx and pred in label_to_idx:
-                matrix[label_to_idx[actual], label_to_idx[pred]] += 1
-        return matrix
-
-    def _compute_classification_report(self, actuals: np.ndarray, predictions: np.ndarray, labels: List[int]) -> Dict[str, Dict[str, float]]:
+        num_labels = len(labels)
+        actual_idx, actual_valid = self._label_positions(actuals, labels)
+        pred_idx, pred_valid = self._label_positions(predictions, labels)
+
+        # Pairs where both moves are among the labels are counted in one pass over a flattened matrix index
+        valid = actual_valid & pred_valid
+        flat = actual_idx[valid] * num_labels + pred_idx[valid]
+        return np.bincount(flat, minlength=num_labels * num_labels).reshape(num_labels, num_labels)
+
+    def _label_positions(self, values: np.ndarray, labels: List[int]):
+        # Position of each value in labels, plus a mask of which values are labels at all
+        labels_arr = np.asarray(labels)
+        if labels_arr.size == 0:
+            return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+        order = np.argsort(labels_arr)
+        pos = np.minimum(np.searchsorted(labels_arr, values, sorter=order), len(labels_arr) - 1)
+        idx = order[pos]
+        return idx, labels_arr[idx] == values
+
+    def _compute_classification_report(self, confusion_matrix: np.ndarray, support: np.ndarray, labels: List[int]) -> Dict[str, Dict[str, float]]:
         report: Dict[str, Dict[str, float]] = {}
-        support = Counter(actuals)
-        tp = {label: 0 for label in labels}
-        fp = {label: 0 for label in labels}
-        fn = {label: 0 for label in labels}
-
-        for actual, pred in zip(actuals, predictions):
-            if actual == pred:
-                tp[actual] += 1
-            else:
-                if pred in fp:
-                    fp[pred] += 1
-                if actual in fn:
-                    fn[actual] += 1
-
-        precision = {}
-        recall = {}
-        f1_score = {}
-
-        for label in labels:
-            p_denom = tp[label] + fp[label]
-            r_denom = tp[label] + fn[label]
-            precision[label] = tp[label] / p_denom if p_denom > 0 else 0.0
-            recall[label] = tp[label] / r_denom if r_denom > 0 else 0.0
-            if (precision[label] + recall[label]) > 0:
-                f1_score[label] = 2 * precision[label] * recall[label] / (precision[label] + recall[label])
-            else:
-                f1_score[label] = 0.0
+
+        # Every filtered sample's actual move is a label, so misses also include predictions outside the labels
+        tp = np.diag(confusion_matrix).astype(np.float64)
+        fp = confusion_matrix.sum(axis=0) - tp
+        fn = support - tp
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+            recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+            f1_score = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
 
         # Macro Average
-        macro_p = np.mean(list(precision.values()))
-        macro_r = np.mean(list(recall.values()))
-        macro_f = np.mean(list(f1_score.values()))
-        report['macro avg'] = {'precision': macro_p, 'recall': macro_r, 'f1-score': macro_f, 'support': sum(support[label] for label in labels)}
+        total_s = int(support.sum())
+        report['macro avg'] = {'precision': float(precision.mean()), 'recall': float(recall.mean()), 'f1-score': float(f1_score.mean()), 'support': total_s}
 
         # Weighted Average
-        total_s = sum(support[label] for label in labels)
         if total_s > 0:
-            weighted_p = sum(precision[label] * support[label] for label in labels) / total_s
-            weighted_r = sum(recall[label] * support[label] for label in labels) / total_s
-            weighted_f = sum(f1_score[label] * support[label] for label in labels) / total_s
+            weighted_p, weighted_r, weighted_f = (float(np.average(metric, weights=support)) for metric in (precision, recall, f1_score))
         else:
             weighted_p = weighted_r = weighted_f = 0.0
         report['weighted avg'] = {'precision': weighted_p, 'recall': weighted_r, 'f1-score': weighted_f, 'support': total_s}
 
         # Individual Class Metrics
-        for label in labels:
-            report[label] = {'precision': precision[label], 'recall': recall[label], 'f1-score': f1_score[label], 'support': support[label]}
+        for i, label in enumerate(labels):
+            report[label] = {'precision': float(precision[i]), 'recall': float(recall[i]), 'f1-score': float(f1_score[i]), 'support': int(support[i])}
 
-        return report
\ No newline at end of file
+        return report
@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QTextEdit, QProgressBar, QLabel, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton, QFileDialog, QSizePolicy, QStyle, QFrame
 from PyQt5.QtCore import Qt, QThread
 from PyQt5.QtGui import QColor
+from src.base.process_worker import ProcessWorker
 
 class BaseTab(QWidget):
     def __init__(self, parent=None):
@@ -28,12 +29,13 @@ class BaseTab(QWidget):
         self.show_graphs_button = None
         self.start_new_button = None
         self.toggle_buttons_layout = None
-        self.visualization = None
+        self.visualization_factory = None
+        self._visualization = None
 
         # State Management
         self.init_ui_state = True
 
-    def setup_subtab(self, main_layout, intro_text, progress_title, log_title, visualization_title, visualization_widget, control_buttons_config):
+    def setup_subtab(self, main_layout, intro_text, progress_title, log_title, visualization_title, visualization_factory, control_buttons_config):
         # Main Layout Configuration
         main_layout.setSpacing(15)
 
@@ -82,13 +84,12 @@ class BaseTab(QWidget):
         main_layout.addWidget(self.log_group)
         self.log_group.setVisible(False)
 
-        # Visualization Group
+        # Visualization Group; the widget itself is only built on first use
         self.visualization_group = None
-        if visualization_widget is not None:
+        self.visualization_factory = visualization_factory
+        if visualization_factory is not None:
             self.visualization_group = QGroupBox(visualization_title)
-            vis_layout = QVBoxLayout(self.visualization_group)
-            visualization_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            vis_layout.addWidget(visualization_widget)
+            QVBoxLayout(self.visualization_group)
             main_layout.addWidget(self.visualization_group)
             self.visualization_group.setVisible(False)
 
@@ -164,6 +165,19 @@ class BaseTab(QWidget):
         # Final Layout Setup
         self.setLayout(main_layout)
 
+    @property
+    def visualization(self):
+        if self._visualization is None and self.visualization_factory is not None:
+            self._visualization = self.visualization_factory()
+            self._visualization.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            self.visualization_group.layout().addWidget(self._visualization)
+        return self._visualization
+
+    def reset_visualization(self):
+        # Plots that were never built have nothing to reset
+        if self._visualization is not None:
+            self._visualization.reset_visualization()
+
     def show_logs_view(self):
         if self.show_logs_button and self.show_logs_button.isChecked():
             if self.show_graphs_button:
@@ -179,7 +193,7 @@ class BaseTab(QWidget):
                 self.show_logs_button.setChecked(False)
             if self.log_group:
                 self.log_group.setVisible(False)
-            if self.visualization_group:
+            if self.visualization_group and self.visualization is not None:
                 self.visualization_group.setVisible(True)
 
     def start_worker(self, worker_class, *args, **kwargs):
@@ -204,6 +218,22 @@ class BaseTab(QWidget):
         self.thread.start()
         return True
 
+    def start_process_worker(self, worker_class, *args):
+        if self.worker is not None:
+            return False
+
+        # Runs the worker in a separate Python process so it never contends for the GUI's GIL
+        self.worker = ProcessWorker.create(worker_class, *args)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.paused.connect(self.on_worker_paused)
+        self.worker.log_update.connect(self.handle_log_update)
+        self.worker.progress_update.connect(self.update_progress)
+        self.worker.time_left_update.connect(self.update_time_left)
+
+        self.worker.start()
+        return True
+
     def on_worker_finished(self):
         self.worker = None
         self.thread = None
@@ -243,7 +273,7 @@ class BaseTab(QWidget):
 
     def on_checkpoint_enabled_changed(self, state, checkpoint_type_combo, interval_widgets):
         is_enabled = state == Qt.Checked
-        self.toggle_widget_state([checkpoint_type_combo], state=is_enabled, attribute="enabled")
+        checkpoint_type_combo.setEnabled(is_enabled)
         self.on_checkpoint_type_changed(checkpoint_type_combo.currentText(), interval_widgets)
 
     def on_checkpoint_type_changed(self, text, interval_widgets):
@@ -251,16 +281,15 @@ class BaseTab(QWidget):
         t = text.lower()
         for key, widget in interval_widgets.items():
             visible = is_enabled and (key == t)
-            self.toggle_widget_state([widget], state=visible, attribute="visible")
+            widget.setVisible(visible)
+
+    def set_widgets_enabled(self, widgets, enabled):
+        for widget in widgets:
+            widget.setEnabled(enabled)
 
-    def toggle_widget_state(self, widgets, state=None, attribute="enabled"):
-        if not isinstance(widgets, list):
-            widgets = [widgets]
+    def set_widgets_visible(self, widgets, visible):
         for widget in widgets:
-            if attribute == "enabled":
-                widget.setEnabled(not widget.isEnabled() if state is None else state)
-            elif attribute == "visible":
-                widget.setVisible(not widget.isVisible() if state is None else state)
+            widget.setVisible(visible)
 
     def create_browse_layout(self, line_edit, browse_button):
         layout = QHBoxLayout()
@@ -281,6 +310,14 @@ class BaseTab(QWidget):
         widget_layout.addStretch()
         return widget
 
+    def parse_positive_int(self, line_edit):
+        # Digit check first so invalid input never goes through int() and an exception
+        text = line_edit.text().strip()
+        if not text.isdecimal():
+            return None
+        value = int(text)
+        return value if value > 0 else None
+
     def browse_file(self, input_field, title, file_filter):
         file_path, _ = QFileDialog.getOpenFileName(self, title, input_field.text(), file_filter)
         if file_path:
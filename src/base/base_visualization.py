@@ -33,7 +33,6 @@ class BasePlot:
         self.ax.grid(True, which='both', linestyle='--', linewidth=0.6, alpha=self.grid_alpha, color=self.grid_color)
         if self.invert_y:
             self.ax.invert_yaxis()
-        self.ax.figure.tight_layout()
 
 class BaseVisualizationWidget(QWidget):
     def __init__(self, parent=None):
@@ -57,6 +56,13 @@ class BaseVisualizationWidget(QWidget):
         # Plot Management
         self.plots = {}
         self.init_visualization()
+        self.figure.tight_layout()
+
+        # Layout is recomputed on resize rather than on every redraw
+        self.canvas.mpl_connect('resize_event', self.on_canvas_resize)
+
+    def on_canvas_resize(self, event):
+        self.figure.tight_layout()
 
     def update_visualization(self):
         self.canvas.draw_idle()
@@ -65,6 +71,7 @@ class BaseVisualizationWidget(QWidget):
         self.figure.clear()
         self.plots = {}
         self.init_visualization()
+        self.figure.tight_layout()
         self.canvas.draw_idle()
 
     def clear_axis(self, plot_key):
@@ -74,4 +81,4 @@ class BaseVisualizationWidget(QWidget):
 
     def add_text_to_axis(self, plot_key, text):
         ax = self.plots[plot_key].ax
-        ax.text(0.5, 0.5, text, ha='center', va='center', fontsize=12, fontweight='bold', color='#555555', transform=ax.transAxes)
\ No newline at end of file
+        return ax.text(0.5, 0.5, text, ha='center', va='center', fontsize=12, fontweight='bold', color='#555555', transform=ax.transAxes)
\ No newline at end of file
@@ -0,0 +1,86 @@
+import base64
+import os
+import pickle
+import sys
+from PyQt5.QtCore import QObject, QProcess, pyqtSignal
+
+class ProcessWorker(QObject):
+    # Signals every worker has; worker-specific signals are added per worker class by create()
+    log_update = pyqtSignal(str, str)
+    progress_update = pyqtSignal(int)
+    time_left_update = pyqtSignal(str)
+    finished = pyqtSignal()
+    paused = pyqtSignal(bool)
+    task_finished = pyqtSignal()
+
+    # Proxy class per worker class, built on first use
+    _proxy_classes = {}
+
+    @classmethod
+    def create(cls, worker_class, *args):
+        proxy_class = cls._proxy_classes.get(worker_class)
+        if proxy_class is None:
+            # Reuse the worker's own signal declarations, so the proxy emits with the same signatures
+            signals = {name: getattr(worker_class, name) for name in dir(worker_class) if isinstance(getattr(worker_class, name), pyqtSignal) and not hasattr(cls, name)}
+            proxy_class = cls._proxy_classes[worker_class] = type(f"{worker_class.__name__}Process", (cls,), signals)
+        return proxy_class(worker_class, *args)
+
+    def __init__(self, worker_class, *args):
+        super().__init__()
+        self.output_buffer = b""
+        script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../scripts/run_worker.py"))
+        encoded_args = base64.b64encode(pickle.dumps(args)).decode("ascii")
+
+        self.process = QProcess(self)
+        self.process.setProgram(sys.executable)
+        self.process.setArguments([script_path, f"{worker_class.__module__}:{worker_class.__name__}", encoded_args])
+        self.process.readyReadStandardOutput.connect(self.read_output)
+        self.process.readyReadStandardError.connect(self.read_errors)
+        self.process.finished.connect(self.on_process_finished)
+
+    def start(self):
+        self.process.start()
+
+    def pause(self):
+        self.send_command("pause")
+
+    def resume(self):
+        self.send_command("resume")
+
+    def stop(self):
+        self.send_command("stop")
+
+    def send_command(self, command):
+        if self.process.state() == QProcess.Running:
+            self.process.write(f"{command}\n".encode("ascii"))
+
+    def read_output(self):
+        self.output_buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self.output_buffer = self.output_buffer.split(b"\n")
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                name, values = pickle.loads(base64.b64decode(line, validate=True))
+            except Exception:
+                # Anything else the subprocess printed is passed through as a log line
+                self.log_update.emit("INFO", line.decode("utf-8", errors="replace"))
+                continue
+
+            # Completion is reported once the process has actually exited
+            if name != "finished" and hasattr(self, name):
+                getattr(self, name).emit(*values)
+
+    def read_errors(self):
+        text = bytes(self.process.readAllStandardError()).decode("utf-8", errors="replace").strip()
+        # Libraries write warnings and progress to stderr; a failed run is reported by its exit code
+        if text:
+            self.log_update.emit("WARNING", text)
+
+    def on_process_finished(self, exit_code, exit_status):
+        self.read_output()
+        self.read_errors()
+        if exit_status != QProcess.NormalExit or exit_code != 0:
+            self.log_update.emit("ERROR", f"Worker process exited with code {exit_code}.")
+        self.finished.emit()
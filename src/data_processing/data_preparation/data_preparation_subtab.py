@@ -1,15 +1,19 @@
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QGridLayout, QLineEdit, QPushButton, QMessageBox, QLabel
-from src.data_processing.data_preparation.data_preparation_worker import DataPreparationWorker
-from src.data_processing.data_preparation.data_preparation_visualization import DataPreparationVisualization
 from src.base.base_tab import BaseTab
 import os
+import stat
 
 class DataPreparationSubTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.visualization = DataPreparationVisualization()
         self.init_ui()
 
+    def create_visualization(self):
+        # Matplotlib and NumPy load with the plots the first time they are needed, not at application startup
+        from src.data_processing.data_preparation.data_preparation_visualization import DataPreparationVisualization
+        return DataPreparationVisualization()
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
         self.setup_subtab(
@@ -18,7 +22,7 @@ class DataPreparationSubTab(BaseTab):
             "Data Preparation Progress",
             "Data Preparation Logs",
             "Data Preparation Visualization",
-            self.visualization,
+            self.create_visualization,
             {
                 "start_text": "Start Data Preparation",
                 "stop_text": "Stop",
@@ -91,41 +95,41 @@ class DataPreparationSubTab(BaseTab):
         self.layout().insertWidget(2, self.pgn_file_group)
         self.layout().insertWidget(3, self.engine_config_group)
 
-        self.stop_button.setEnabled(False)
-        if self.pause_button:
-            self.pause_button.setEnabled(False)
-        if self.resume_button:
-            self.resume_button.setEnabled(False)
+        # Widget groups whose state flips together on start and reset
+        self.input_groups = (self.parameters_group, self.pgn_file_group, self.engine_config_group)
+        self.run_groups = (self.progress_group, self.control_group, self.log_group)
+        self.view_buttons = tuple(button for button in (self.show_logs_button, self.show_graphs_button) if button)
+        self.run_buttons = tuple(button for button in (self.stop_button, self.pause_button, self.resume_button) if button)
+
+        self.set_widgets_enabled(self.run_buttons, False)
 
     def start_process(self):
-        try:
-            max_games = int(self.max_games_input.text())
-            min_elo = int(self.min_elo_input.text())
-            batch_size = int(self.batch_size_input.text())
-            if max_games <= 0 or min_elo <= 0 or batch_size <= 0:
-                raise ValueError
-        except ValueError:
+        max_games, min_elo, batch_size = [self.parse_positive_int(w) for w in (self.max_games_input, self.min_elo_input, self.batch_size_input)]
+        if None in (max_games, min_elo, batch_size):
             QMessageBox.warning(self, "Input Error", "Max Games, Minimum ELO, and Batch Size must be positive integers.")
             return
 
         pgn_file = self.pgn_file_input.text().strip()
 
-        if not os.path.isfile(pgn_file):
+        # One stat call both checks the file exists and catches an empty file before the worker starts
+        try:
+            pgn_stat = os.stat(pgn_file)
+        except OSError:
+            pgn_stat = None
+        if pgn_stat is None or not stat.S_ISREG(pgn_stat.st_mode):
             QMessageBox.warning(self, "Error", "Selected PGN file does not exist.")
             return
+        if pgn_stat.st_size == 0:
+            QMessageBox.warning(self, "Error", "Selected PGN file is empty.")
+            return
 
         engine_path = self.engine_path_input.text().strip()
         if not engine_path:
             QMessageBox.warning(self, "Error", "Engine path cannot be empty.")
             return
 
-        try:
-            engine_depth = int(self.engine_depth_input.text())
-            engine_threads = int(self.engine_threads_input.text())
-            engine_hash = int(self.engine_hash_input.text())
-            if engine_depth <= 0 or engine_threads <= 0 or engine_hash <= 0:
-                raise ValueError
-        except ValueError:
+        engine_depth, engine_threads, engine_hash = [self.parse_positive_int(w) for w in (self.engine_depth_input, self.engine_threads_input, self.engine_hash_input)]
+        if None in (engine_depth, engine_threads, engine_hash):
             QMessageBox.warning(self, "Input Error", "Depth, Threads, and Hash must be positive integers.")
             return
 
@@ -139,26 +143,21 @@ class DataPreparationSubTab(BaseTab):
         self.progress_bar.setFormat("Starting...")
         self.remaining_time_label.setText("Time Left: Calculating...")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
-        self.parameters_group.setVisible(False)
-        self.pgn_file_group.setVisible(False)
-        self.engine_config_group.setVisible(False)
-        self.progress_group.setVisible(True)
-        self.control_group.setVisible(True)
-        self.log_group.setVisible(True)
+        self.reset_visualization()
+        self.set_widgets_visible(self.input_groups, False)
+        self.set_widgets_visible(self.run_groups, True)
         if self.visualization_group:
             self.visualization_group.setVisible(False)
-        if self.show_logs_button:
-            self.show_logs_button.setVisible(True)
-        if self.show_graphs_button:
-            self.show_graphs_button.setVisible(True)
+        self.set_widgets_visible(self.view_buttons, True)
         if self.start_new_button:
             self.start_new_button.setVisible(False)
         self.init_ui_state = False
 
-        started = self.start_worker(DataPreparationWorker, pgn_file, max_games, min_elo, batch_size, engine_path, engine_depth, engine_threads, engine_hash)
+        # The worker's modules are only needed once a run starts, so they stay out of application startup
+        from src.data_processing.data_preparation.data_preparation_worker import DataPreparationWorker
+        started = self.start_process_worker(DataPreparationWorker, pgn_file, max_games, min_elo, batch_size, engine_path, engine_depth, engine_threads, engine_hash)
         if started:
-            self.worker.stats_update.connect(self.visualization.update_data_visualization)
+            self.worker.stats_update.connect(self.visualization.update_data_visualization, Qt.QueuedConnection | Qt.UniqueConnection)
         else:
             self.reset_to_initial_state()
 
@@ -167,19 +166,14 @@ class DataPreparationSubTab(BaseTab):
         self.reset_to_initial_state()
 
     def reset_to_initial_state(self):
-        self.parameters_group.setVisible(True)
-        self.pgn_file_group.setVisible(True)
-        self.engine_config_group.setVisible(True)
+        self.set_widgets_visible(self.input_groups, True)
         self.progress_group.setVisible(False)
         self.log_group.setVisible(False)
         if self.visualization_group:
             self.visualization_group.setVisible(False)
         if self.start_new_button:
             self.start_new_button.setVisible(False)
-        if self.show_logs_button:
-            self.show_logs_button.setVisible(False)
-        if self.show_graphs_button:
-            self.show_graphs_button.setVisible(False)
+        self.set_widgets_visible(self.view_buttons, False)
         if self.show_logs_button:
             self.show_logs_button.setChecked(True)
         if self.show_graphs_button:
@@ -188,13 +182,8 @@ class DataPreparationSubTab(BaseTab):
         self.progress_bar.setFormat("Idle")
         self.remaining_time_label.setText("Time Left: N/A")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
         if self.start_button:
             self.start_button.setEnabled(True)
-        if self.stop_button:
-            self.stop_button.setEnabled(False)
-        if self.pause_button:
-            self.pause_button.setEnabled(False)
-        if self.resume_button:
-            self.resume_button.setEnabled(False)
+        self.set_widgets_enabled(self.run_buttons, False)
         self.init_ui_state = True
\ No newline at end of file
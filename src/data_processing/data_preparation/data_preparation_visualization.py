@@ -1,3 +1,4 @@
+from PyQt5.QtCore import QTimer
 from src.base.base_visualization import BasePlot, BaseVisualizationWidget
 import numpy as np
 import time
@@ -5,6 +6,18 @@ import time
 class DataPreparationVisualization(BaseVisualizationWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+
+        # Coalesce bursts of stats updates into at most one redraw per interval
+        self._dirty = False
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(100)
+        self._redraw_timer.timeout.connect(self._do_redraw)
+
+        # The games-processed line is blitted over a cached background; any full draw (including resizes) refreshes it
+        self._bg_games = None
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
+
         self.reset_visualization()
 
     def init_visualization(self):
@@ -24,75 +37,167 @@ class DataPreparationVisualization(BaseVisualizationWidget):
             'player_ratings': BasePlot(self.ax_player_ratings, title='Player Rating Distribution', xlabel='Player Rating', ylabel='Frequency'),
         }
 
-    def update_data_visualization(self, stats):
-        self.game_results = stats.get('game_results_counter', self.game_results)
-        total_games = stats.get('total_games_processed', 0)
+        # Persistent artists, updated in place on every redraw
+        self.no_data_texts = {key: self.add_text_to_axis(key, 'No Data Yet') for key in self.plots}
+        self.pie_start_angle = 140
+        self.pie_explode = 0.05
+        labels = ['White Wins', 'Black Wins', 'Draws']
+        colors = ['#4CAF50', '#F44336', '#FFC107']
+        self.result_wedges, self.result_labels, self.result_pct_texts = self.ax_game_results.pie([1, 1, 1], labels=labels, autopct='%1.1f%%', startangle=self.pie_start_angle, colors=colors, explode=[self.pie_explode] * 3, shadow=False, textprops={'color': '#333333', 'fontsize': 10})
+        self.ax_game_results.axis('equal')
+        self.games_processed_line, = self.ax_games_processed.plot([], [], marker='o', color='#2196F3', alpha=0.8, linewidth=1.5, animated=True)
+        self.game_length_bars = None
+        self.player_rating_bars = None
+
+    def update_data_visualization(self, game_length_bytes, player_rating_bytes, total_games, game_results):
+        # Histograms arrive as raw int32 bytes and are viewed in place without copying
+        game_length_histogram = np.frombuffer(game_length_bytes, dtype=np.int32)
+        player_rating_histogram = np.frombuffer(player_rating_bytes, dtype=np.int32)
+
+        # Only the games-processed line changes unless one of the other panels did too
+        self._panels_dirty = self._panels_dirty or game_results != self.game_results or not np.array_equal(game_length_histogram, self.game_length_histogram) or not np.array_equal(player_rating_histogram, self.player_rating_histogram)
+
+        self.game_results = game_results
+        self.game_length_histogram = game_length_histogram
+        self.player_rating_histogram = player_rating_histogram
 
         # Update processing time
         if self.start_time is None:
             self.start_time = time.time()
-            self.processing_times = [0]
+            elapsed = 0.0
         else:
-            self.processing_times.append(time.time() - self.start_time)
+            elapsed = time.time() - self.start_time
 
-        self.total_games_processed.append(total_games)
-        self.game_length_bins = np.array(stats.get('game_length_bins', self.game_length_bins))
-        self.game_length_histogram = np.array(stats.get('game_length_histogram', self.game_length_histogram))
-        self.player_rating_bins = np.array(stats.get('player_rating_bins', self.player_rating_bins))
-        self.player_rating_histogram = np.array(stats.get('player_rating_histogram', self.player_rating_histogram))
+        # Record the sample in the ring buffer, overwriting the oldest once full
+        i = self.num_samples % self.history_capacity
+        self.processing_times[i] = elapsed
+        self.total_games_processed[i] = total_games
+        self.num_samples += 1
 
-        # Update game results plot
-        self.clear_axis('game_results')
-        results = [self.game_results.get(val, 0) for val in [1.0, -1.0, 0.0]]
-        total = sum(results)
-        if total > 0:
-            percentages = [(count / total) * 100 for count in results]
-            labels = ['White Wins', 'Black Wins', 'Draws']
-            colors = ['#4CAF50', '#F44336', '#FFC107']
-            explode = (0.05, 0.05, 0.05)
-
-            self.ax_game_results.pie(percentages, labels=labels, autopct='%1.1f%%', startangle=140, colors=colors, explode=explode, shadow=False, textprops={'color': '#333333', 'fontsize': 10})
-            self.ax_game_results.axis('equal')
-        else:
-            self.add_text_to_axis('game_results', 'No Data Yet')
-
-        # Update games processed plot
-        self.clear_axis('games_processed')
-        if self.total_games_processed and self.processing_times:
-            self.ax_games_processed.plot(self.processing_times, self.total_games_processed, marker='o', color='#2196F3', alpha=0.8, linewidth=1.5)
-            self.ax_games_processed.relim()
-            self.ax_games_processed.autoscale_view()
-        else:
-            self.add_text_to_axis('games_processed', 'No Data Yet')
-
-        # Update game lengths plot
-        self.clear_axis('game_lengths')
-        if self.game_length_histogram is not None and np.any(self.game_length_histogram > 0):
-            self.ax_game_lengths.bar(self.game_length_bins[:-1], self.game_length_histogram, width=np.diff(self.game_length_bins), align='edge', color='#9C27B0', edgecolor='black', alpha=0.7)
-            self.ax_game_lengths.relim()
-            self.ax_game_lengths.autoscale_view()
-        else:
-            self.add_text_to_axis('game_lengths', 'No Data Yet')
-
-        # Update player ratings plot
-        self.clear_axis('player_ratings')
-        if self.player_rating_histogram is not None and np.any(self.player_rating_histogram > 0):
-            self.ax_player_ratings.bar(self.player_rating_bins[:-1], self.player_rating_histogram, width=np.diff(self.player_rating_bins), align='edge', color='#FF5722', edgecolor='black', alpha=0.7)
-            self.ax_player_ratings.relim()
-            self.ax_player_ratings.autoscale_view()
-        else:
-            self.add_text_to_axis('player_ratings', 'No Data Yet')
+        # Schedule a redraw instead of drawing on every update
+        self._dirty = True
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
+
+    def _do_redraw(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        limits_changed = self.update_games_processed_plot()
+        if not self._panels_dirty and not limits_changed and self._bg_games is not None:
+            self._blit_games_processed()
+            return
+
+        self._panels_dirty = False
+        self.update_game_results_plot()
+        self.update_game_lengths_plot()
+        self.update_player_ratings_plot()
 
         # Refresh visualization
         self.update_visualization()
 
+    def _on_canvas_draw(self, event):
+        self._bg_games = self.canvas.copy_from_bbox(self.ax_games_processed.bbox)
+        self.ax_games_processed.draw_artist(self.games_processed_line)
+
+    def _blit_games_processed(self):
+        self.canvas.restore_region(self._bg_games)
+        self.ax_games_processed.draw_artist(self.games_processed_line)
+        self.canvas.blit(self.ax_games_processed.bbox)
+
+    def update_game_results_plot(self):
+        results = [self.game_results.get(val, 0) for val in [1.0, -1.0, 0.0]]
+        total = sum(results)
+        has_data = total > 0
+        self.no_data_texts['game_results'].set_visible(not has_data)
+        for artist in (*self.result_wedges, *self.result_labels, *self.result_pct_texts):
+            artist.set_visible(has_data)
+        if not has_data:
+            return
+
+        # Move the existing wedges and their labels instead of rebuilding the pie
+        theta = self.pie_start_angle
+        for wedge, label, pct_text, count in zip(self.result_wedges, self.result_labels, self.result_pct_texts, results):
+            percentage = count / total * 100
+            theta1, theta = theta, theta + percentage * 3.6
+            mid = np.deg2rad((theta1 + theta) / 2)
+            direction = np.array([np.cos(mid), np.sin(mid)])
+            center = self.pie_explode * direction
+            wedge.set_center(center)
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta)
+            label.set_position(center + 1.1 * direction)
+            label.set_horizontalalignment('left' if direction[0] > 0 else 'right')
+            pct_text.set_position(center + 0.6 * direction)
+            pct_text.set_text(f'{percentage:.1f}%')
+
+    def update_games_processed_plot(self) -> bool:
+        has_data = self.num_samples > 0
+        visibility_changed = self.no_data_texts['games_processed'].get_visible() == has_data
+        self.no_data_texts['games_processed'].set_visible(not has_data)
+        processing_times, total_games_processed = self.get_games_processed_history()
+        self.games_processed_line.set_data(processing_times, total_games_processed)
+
+        if not has_data:
+            return visibility_changed
+
+        # Limits grow with headroom so most updates fit and can be blitted;
+        # a change in limits redraws the ticks, which invalidates the cached background
+        max_time, max_games = processing_times[-1], total_games_processed.max()
+        x_max, y_max = self.ax_games_processed.get_xlim()[1], self.ax_games_processed.get_ylim()[1]
+        if max_time <= x_max and max_games <= y_max:
+            return visibility_changed
+        self.ax_games_processed.set_xlim(0, max(max_time * 1.5, x_max))
+        self.ax_games_processed.set_ylim(0, max(max_games * 1.5, y_max))
+        return True
+
+    def get_games_processed_history(self):
+        # Samples in chronological order, unrolling the ring buffer once it has wrapped
+        if self.num_samples <= self.history_capacity:
+            return self.processing_times[:self.num_samples], self.total_games_processed[:self.num_samples]
+        i = self.num_samples % self.history_capacity
+        return np.concatenate((self.processing_times[i:], self.processing_times[:i])), np.concatenate((self.total_games_processed[i:], self.total_games_processed[:i]))
+
+    def update_game_lengths_plot(self):
+        self.game_length_bars = self.update_histogram_bars('game_lengths', self.game_length_bars, self.game_length_bins, self.game_length_widths, self.game_length_histogram, '#9C27B0')
+
+    def update_player_ratings_plot(self):
+        self.player_rating_bars = self.update_histogram_bars('player_ratings', self.player_rating_bars, self.player_rating_bins, self.player_rating_widths, self.player_rating_histogram, '#FF5722')
+
+    def update_histogram_bars(self, plot_key, bars, bins, widths, histogram, color):
+        ax = self.plots[plot_key].ax
+        self.no_data_texts[plot_key].set_visible(histogram is None or not np.any(histogram > 0))
+        if histogram is None:
+            return bars
+
+        # Bars are only rebuilt if the binning changes; otherwise just their heights move
+        if bars is None or len(bars) != len(histogram):
+            if bars is not None:
+                bars.remove()
+            bars = ax.bar(bins[:-1], histogram, width=widths, align='edge', color=color, edgecolor='black', alpha=0.7)
+        else:
+            for rect, height in zip(bars, histogram):
+                rect.set_height(height)
+        ax.relim()
+        ax.autoscale_view()
+        return bars
+
     def reset_visualization(self):
+        self._redraw_timer.stop()
+        self._dirty = False
+        self._panels_dirty = True
+        self._bg_games = None
         self.game_results = {1.0: 0, -1.0: 0, 0.0: 0}
-        self.total_games_processed = []
-        self.processing_times = []
+        self.history_capacity = 8192
+        self.processing_times = np.zeros(self.history_capacity, dtype=np.float64)
+        self.total_games_processed = np.zeros(self.history_capacity, dtype=np.int64)
+        self.num_samples = 0
         self.game_length_bins = np.arange(0, 200, 5)
-        self.game_length_histogram = np.zeros(len(self.game_length_bins) - 1, dtype=int)
+        self.game_length_widths = np.diff(self.game_length_bins)
+        self.game_length_histogram = np.zeros(len(self.game_length_bins) - 1, dtype=np.int32)
         self.player_rating_bins = np.arange(1000, 3000, 50)
-        self.player_rating_histogram = np.zeros(len(self.player_rating_bins) - 1, dtype=int)
+        self.player_rating_widths = np.diff(self.player_rating_bins)
+        self.player_rating_histogram = np.zeros(len(self.player_rating_bins) - 1, dtype=np.int32)
         self.start_time = None
         super().reset_visualization()
\ No newline at end of file
@@ -1,19 +1,227 @@
 import os
 import io
 import time
-from collections import defaultdict
+import threading
+import multiprocessing as mp
+from multiprocessing.util import Finalize
+from collections import OrderedDict
 import chess
 import chess.pgn
 import chess.engine
+import chess.polyglot
 import h5py
+import hdf5plugin
 import numpy as np
 from PyQt5.QtCore import pyqtSignal
 from src.base.base_worker import BaseWorker
-from src.utils.chess_utils import convert_board_to_tensor, flip_board, flip_move, get_move_mapping
+from src.data_processing.data_preparation.pgn_chunker import iter_chunks, read_chunk
+from src.utils.chess_utils import BOARD_ENCODING_VERSION, convert_board_to_tensor, encode_feature_planes, update_piece_planes, flip_board_tensor, get_move_mapping, pack_board_planes
 from src.utils.common_utils import estimate_total_games, update_progress_time_left, wait_if_paused, parse_game_result
+from src.utils.logger import Logger, QueueLogSignal
+
+# Bitshuffled zstd compresses the sparse 0/1 board planes far better than LZF at a similar speed
+H5_COMPRESSION = hdf5plugin.Blosc2(cname="zstd", clevel=3, filters=hdf5plugin.Blosc2.BITSHUFFLE)
+
+# Rows per HDF5 chunk, kept within ~10 KB-1 MB since training reads single samples in random order
+INPUT_CHUNK_ROWS = 256
+TARGET_CHUNK_ROWS = 4096
+
+# Rough samples per kept game, counting mirrored copies, used to pre-size the datasets
+SAMPLES_PER_GAME = 80
+
+# Writes before the last one cover whole chunks of every dataset, so no chunk is ever read back and recompressed
+WRITE_ALIGN_ROWS = TARGET_CHUNK_ROWS
+
+# Minimum seconds between stats updates sent to the UI
+STATS_EMIT_INTERVAL = 0.25
+
+# Engine evaluations remembered per parsing process, keyed by Zobrist hash
+EVAL_CACHE_SIZE = 200000
+
+# Node cap on top of the configured depth, so tactical positions can't blow up the search time
+ENGINE_NODE_LIMIT = 200000
+
+# Chunks handed to the pool ahead of the results read back, per parsing process
+CHUNKS_IN_FLIGHT_PER_PROCESS = 2
+
+# Per-process state for PGN parsing processes, set up once by the pool initializer
+_chunk_process = {}
+
+def _init_chunk_process(min_elo: int, engine_path: str, engine_depth: int, engine_threads: int, engine_hash: int, stop_event, pause_event, log_queue):
+    # Each parsing process evaluates its own positions, so it gets its own engine
+    engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+    engine.configure({
+        "Threads": engine_threads,
+        "Hash": engine_hash
+    })
+    # Quit the engine when the process exits; early stops also end the processes normally, through stop_event
+    Finalize(None, engine.quit, exitpriority=10)
+    _chunk_process.update({
+        "min_elo": min_elo,
+        "engine": engine,
+        "engine_depth": engine_depth,
+        "eval_cache": OrderedDict(),
+        "move_mapping": get_move_mapping(),
+        "stop_event": stop_event,
+        "pause_event": pause_event,
+        "logger": Logger(log_signal=QueueLogSignal(log_queue)),
+    })
+
+def _parse_chunk(chunk: tuple) -> list:
+    state = _chunk_process
+    if state["stop_event"].is_set():
+        return []
+    pgn_path, start, end = chunk
+    pgn = io.StringIO(read_chunk(pgn_path, start, end).decode("utf-8", errors="ignore"))
+
+    results = []
+    while not state["stop_event"].is_set():
+        wait_if_paused(state["pause_event"])
+
+        # Headers are read on their own first, so rejected games skip move parsing entirely
+        offset = pgn.tell()
+        headers = chess.pgn.read_headers(pgn)
+        if headers is None:
+            break
+
+        header_info = _read_header_info(headers, state["min_elo"])
+        if header_info is None:
+            continue
+
+        pgn.seek(offset)
+        game = chess.pgn.read_game(pgn)
+        if game is None:
+            break
+
+        result = _process_game(game, header_info, state)
+        if result is not None:
+            results.append(result)
+    return results
+
+def _read_header_info(headers: chess.pgn.Headers, min_elo: int):
+    white_elo_str = headers.get("WhiteElo")
+    black_elo_str = headers.get("BlackElo")
+    if not white_elo_str or not black_elo_str:
+        return None
+    try:
+        white_elo = int(white_elo_str)
+        black_elo = int(black_elo_str)
+    except ValueError:
+        return None
+
+    # Skip if ELO too low
+    if white_elo < min_elo or black_elo < min_elo:
+        return None
+
+    # Check result
+    game_result = parse_game_result(headers.get("Result", "*"))
+    if game_result is None:
+        return None
+
+    return (white_elo + black_elo) / 2, game_result
+
+def _process_game(game: chess.pgn.Game, header_info: tuple, state: dict):
+    try:
+        avg_rating, game_result = header_info
+
+        board = game.board()
+        moves = list(game.mainline_moves())
+        inputs, policy_targets, value_targets = _extract_move_data(board, moves, state)
+
+        if not inputs:
+            return None
+
+        # Stacked, packed arrays pickle far more compactly than lists of per-position float arrays
+        return {
+            "inputs": pack_board_planes(np.stack(inputs)),
+            "policy_targets": np.array(policy_targets, dtype=np.uint16),
+            "value_targets": np.array(value_targets, dtype=np.float32),
+            "game_length": len(moves),
+            "avg_rating": avg_rating,
+            "game_result": game_result
+        }
+
+    except Exception as e:
+        state["logger"].error(f"Error processing game entry: {str(e)}")
+        return None
+
+def _extract_move_data(board, moves, state: dict):
+    move_mapping = state["move_mapping"]
+    inputs = []
+    policy_targets = []
+    value_targets = []
+
+    # The piece planes are carried from ply to ply and only patched for the squares each move touches
+    planes = convert_board_to_tensor(board)
+    for ply, move in enumerate(moves):
+        move_idx = move_mapping.get_index_by_move(move)
+        if move_idx is None:
+            update_piece_planes(planes, move)
+            board.push(move)
+            continue
+
+        # Attack, castling and clock planes depend on the whole position, so they are rebuilt for each stored sample
+        if ply:
+            encode_feature_planes(board, planes)
+
+        # Evaluate current position BEFORE making the move
+        value_target = _evaluate_cached(board, state)
+
+        current_tensor = planes.copy()
+        inputs.append(current_tensor)
+        policy_targets.append(move_idx)
+        value_targets.append(value_target)
+
+        # Handle board flipping for data augmentation
+        flipped_move_idx = int(move_mapping.MIRROR_INDEX[move_idx])
+        if flipped_move_idx >= 0:
+            flipped_tensor = flip_board_tensor(current_tensor)
+            inputs.append(flipped_tensor)
+            policy_targets.append(flipped_move_idx)
+            flipped_value_target = -value_target
+            value_targets.append(flipped_value_target)
+
+        update_piece_planes(planes, move)
+        board.push(move)
+
+    return inputs, policy_targets, value_targets
+
+def _evaluate_cached(board, state: dict) -> float:
+    # Openings and common middlegame structures repeat across games, so evaluations are reused
+    cache = state["eval_cache"]
+    key = chess.polyglot.zobrist_hash(board)
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+        return value
+
+    value = evaluate_position(state["engine"], board, state["engine_depth"])
+    cache[key] = value
+    if len(cache) > EVAL_CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+def evaluate_position(engine, board, depth):
+    if engine is None:
+        return 0.0
+
+    limit = chess.engine.Limit(depth=depth, nodes=ENGINE_NODE_LIMIT)
+    # Only the score is used, so the engine's PV and other info are not parsed
+    info = engine.analyse(board, limit=limit, info=chess.engine.INFO_SCORE)
+    score = info["score"].pov(board.turn)
+
+    if score.is_mate():
+        mate_in = score.mate()
+        # +1 if mate for side to move, -1 if mate against
+        return 1.0 if mate_in > 0 else -1.0
+    else:
+        cp = score.score()  # centipawns
+        cp_clamped = max(min(cp, 1000), -1000)
+        return cp_clamped / 1000.0
 
 class DataPreparationWorker(BaseWorker):
-    stats_update = pyqtSignal(dict)
+    # Raw int32 bytes of the game length and player rating histograms, total games processed, game results counter
+    stats_update = pyqtSignal(bytes, bytes, int, dict)
 
     def __init__(self, raw_pgn_file: str, max_games: int, min_elo: int, batch_size: int, engine_path: str, engine_depth: int, engine_threads: int, engine_hash: int):
         super().__init__()
@@ -21,27 +229,36 @@ class DataPreparationWorker(BaseWorker):
         self.max_games = max_games
         self.min_elo = min_elo
         self.batch_size = batch_size
-        self.engine = None
+        # Each parsing process runs its own engine, so split the spare cores by the engine's thread count
+        self.num_processes = max(1, ((os.cpu_count() or 2) - 1) // max(1, engine_threads))
         self.engine_path = engine_path
         self.engine_depth = engine_depth
         self.engine_threads = engine_threads
         self.engine_hash = engine_hash
-        self.positions = defaultdict(lambda: defaultdict(lambda: {"win": 0, "draw": 0, "loss": 0, "eco": "", "name": ""}))
         self.game_counter = 0
         self.start_time = None
+        self.last_emit_time = 0.0
         self.total_samples = 0
         self.total_games_processed = 0
         self.total_moves_processed = 0
         self.game_results_counter = {1.0: 0, -1.0: 0, 0.0: 0}
         self.game_length_bins = np.arange(0, 200, 5)
-        self.game_length_histogram = np.zeros(len(self.game_length_bins) - 1, dtype=int)
+        self.game_length_histogram = np.zeros(len(self.game_length_bins) - 1, dtype=np.int32)
         self.player_rating_bins = np.arange(1000, 3000, 50)
-        self.player_rating_histogram = np.zeros(len(self.player_rating_bins) - 1, dtype=int)
-        self.batch_inputs = []
-        self.batch_policy_targets = []
-        self.batch_value_targets = []
+        self.player_rating_histogram = np.zeros(len(self.player_rating_bins) - 1, dtype=np.int32)
+        # Per-game lengths and ratings are buffered and binned in bulk when the histograms are needed
+        self.game_length_buffer = np.empty(batch_size, dtype=np.int32)
+        self.player_rating_buffer = np.empty(batch_size, dtype=np.float64)
+        self.game_length_count = 0
+        self.player_rating_count = 0
+        # Samples are copied straight into preallocated arenas and written to HDF5 from slices of them
+        batch_capacity = max(batch_size, WRITE_ALIGN_ROWS) + WRITE_ALIGN_ROWS
+        self.batch_inputs = np.empty((batch_capacity, 25, 8), dtype=np.uint8)
+        self.batch_policy_targets = np.empty(batch_capacity, dtype=np.uint16)
+        self.batch_value_targets = np.empty(batch_capacity, dtype=np.float32)
+        self.batch_fill = 0
         self.current_dataset_size = 0
-        self.move_mapping = get_move_mapping()
+        self.dataset_capacity = 0
         self.output_dir = os.path.abspath(os.path.join("data", "processed"))
         os.makedirs(os.path.dirname(self.output_dir), exist_ok=True)
 
@@ -53,13 +270,9 @@ class DataPreparationWorker(BaseWorker):
                 self.logger.warning(f"No PGN file found at {self.raw_pgn_file}. Aborting data preparation.")
                 return
 
-            # Initialize engine
+            # Make sure the engine starts before any parsing process relies on it
             try:
-                self.engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
-                self.engine.configure({
-                    "Threads": self.engine_threads,
-                    "Hash": self.engine_hash
-                })
+                chess.engine.SimpleEngine.popen_uci(self.engine_path).quit()
             except Exception as e:
                 self.logger.error(f"Could not initialize engine: {str(e)}")
                 return
@@ -69,65 +282,25 @@ class DataPreparationWorker(BaseWorker):
             h5_path = os.path.join(self.output_dir, "dataset.h5")
 
             with h5py.File(h5_path, "w") as h5_file:
-                self.h5_inputs = h5_file.create_dataset("inputs", shape=(0, 25, 8, 8), maxshape=(None, 25, 8, 8), dtype=np.float32, compression="lzf")
-                self.h5_policy_targets = h5_file.create_dataset("policy_targets", shape=(0,), maxshape=(None,), dtype=np.int64, compression="lzf")
-                self.h5_value_targets = h5_file.create_dataset("value_targets", shape=(0,), maxshape=(None,), dtype=np.float32, compression="lzf")
+                h5_file.attrs["board_encoding_version"] = BOARD_ENCODING_VERSION
+                # Sized for the whole run up front; chunks are only allocated once written, and the datasets are trimmed at the end
+                self.dataset_capacity = max(total_estimated_games * SAMPLES_PER_GAME, WRITE_ALIGN_ROWS)
+                self.h5_inputs = h5_file.create_dataset("inputs", shape=(self.dataset_capacity, 25, 8), maxshape=(None, 25, 8), dtype=np.uint8, chunks=(INPUT_CHUNK_ROWS, 25, 8), **H5_COMPRESSION)
+                self.h5_policy_targets = h5_file.create_dataset("policy_targets", shape=(self.dataset_capacity,), maxshape=(None,), dtype=np.uint16, chunks=(TARGET_CHUNK_ROWS,), **H5_COMPRESSION)
+                self.h5_value_targets = h5_file.create_dataset("value_targets", shape=(self.dataset_capacity,), maxshape=(None,), dtype=np.float32, chunks=(TARGET_CHUNK_ROWS,), **H5_COMPRESSION)
 
                 fsize = os.path.getsize(self.raw_pgn_file)
-                self.logger.info(f"Processing PGN file: {os.path.basename(self.raw_pgn_file)} (~{fsize} bytes).")
-
-                with open(self.raw_pgn_file, "r", errors="ignore") as f:
-                    while self.total_games_processed < self.max_games and not self._is_stopped.is_set():
-                        wait_if_paused(self._is_paused)
-
-                        current_pos = f.tell()
-                        line = f.readline()
-                        # If line is empty, we've reached EOF
-                        if not line:
-                            break
-
-                        f.seek(current_pos)
-
-                        game = chess.pgn.read_game(f)
-                        if game is None:
-                            break
+                self.logger.info(f"Processing PGN file: {os.path.basename(self.raw_pgn_file)} (~{fsize} bytes) with {self.num_processes} processes.")
 
-                        # Quick ELO check from headers
-                        headers = game.headers
-                        white_elo_str = headers.get("WhiteElo")
-                        black_elo_str = headers.get("BlackElo")
-                        if not white_elo_str or not black_elo_str:
-                            continue
-                        try:
-                            white_elo = int(white_elo_str)
-                            black_elo = int(black_elo_str)
-                        except ValueError:
-                            continue
-
-                        # Skip if ELO too low
-                        if white_elo < self.min_elo or black_elo < self.min_elo:
-                            continue
-
-                        game_str = str(game)
-                        result = self._process_game(game_str)
-                        if result is None:
-                            continue
-
-                        self._process_data_entry(result)
-                        self.total_games_processed += 1
-
-                        # UI updates every 500 games
-                        if self.total_games_processed % 500 == 0:
-                            update_progress_time_left(self.progress_update, self.time_left_update, self.start_time, self.total_games_processed, total_estimated_games)
-                            self._emit_stats()
+                self._parse_chunks(total_estimated_games)
 
                 # Write any remaining data in memory to disk
-                if self.batch_inputs:
-                    self._write_batch_to_h5()
+                if self.batch_fill:
+                    self._write_batch_to_h5(final=True)
+                self._resize_datasets(self.current_dataset_size)
 
-            # Close engine
-            if self.engine is not None:
-                self.engine.close()
+            # Final stats update so the UI shows the complete totals
+            self._emit_stats()
 
             # Split dataset if we haven't been stopped
             if not self._is_stopped.is_set():
@@ -135,104 +308,85 @@ class DataPreparationWorker(BaseWorker):
 
         except Exception as e:
             self.logger.error(f"Critical error in data preparation: {str(e)}")
-            if self.engine is not None:
-                self.engine.close()
             raise
 
-    def evaluate_position(self, board):
-        if self.engine is None:
-            return 0.0
+    def _parse_chunks(self, total_estimated_games: int):
+        # Spawned rather than forked, since this process already runs Qt and helper threads
+        ctx = mp.get_context("spawn")
+        manager = ctx.Manager()
+        stop_event = manager.Event()
+        pause_event = manager.Event()
+        pause_event.set()
+        log_queue = manager.Queue()
 
-        limit = chess.engine.Limit(depth=self.engine_depth)
-        info = self.engine.analyse(board, limit=limit)
-        score = info["score"].pov(board.turn)
+        relay_done = threading.Event()
+        relay = threading.Thread(target=self._relay_chunk_processes, args=(stop_event, pause_event, log_queue, relay_done), daemon=True)
+        relay.start()
 
-        if score.is_mate():
-            mate_in = score.mate()
-            # +1 if mate for side to move, -1 if mate against
-            return 1.0 if mate_in > 0 else -1.0
-        else:
-            cp = score.score()  # centipawns
-            cp_clamped = max(min(cp, 1000), -1000)
-            return cp_clamped / 1000.0
-
-    def _process_game(self, game_str: str):
         try:
-            game = chess.pgn.read_game(io.StringIO(game_str))
-            if game is None:
-                return None
-
-            headers = game.headers
-            white_elo_str = headers.get("WhiteElo")
-            black_elo_str = headers.get("BlackElo")
-
-            # Already checked, but just in case
-            if not white_elo_str or not black_elo_str:
-                return None
-
-            # Check result
-            result = headers.get("Result", "*")
-            game_result = parse_game_result(result)
-            if game_result is None:
-                return None
-
-            white_elo = int(white_elo_str)
-            black_elo = int(black_elo_str)
-            avg_rating = (white_elo + black_elo) / 2
-
-            board = game.board()
-            moves = list(game.mainline_moves())
-            inputs, policy_targets, value_targets = self._extract_move_data(board, moves)
-
-            if not inputs:
-                return None
-
-            return {
-                "inputs": inputs,
-                "policy_targets": policy_targets,
-                "value_targets": value_targets,
-                "game_length": len(moves),
-                "avg_rating": avg_rating,
-                "game_result": game_result
-            }
-
-        except Exception as e:
-            self.logger.error(f"Error processing game entry: {str(e)}")
-            return None
-
-    def _extract_move_data(self, board, moves):
-        inputs = []
-        policy_targets = []
-        value_targets = []
-
-        for _, move in enumerate(moves):
-            current_tensor = convert_board_to_tensor(board)
-            move_idx = self.move_mapping.get_index_by_move(move)
-            if move_idx is None:
-                board.push(move)
-                continue
-
-            # Evaluate current position BEFORE making the move
-            value_target = self.evaluate_position(board)
-
-            inputs.append(current_tensor)
-            policy_targets.append(move_idx)
-            value_targets.append(value_target)
-
-            # Handle board flipping for data augmentation
-            flipped_board = flip_board(board)
-            flipped_move = flip_move(move)
-            flipped_move_idx = self.move_mapping.get_index_by_move(flipped_move)
-            if flipped_move_idx is not None:
-                flipped_tensor = convert_board_to_tensor(flipped_board)
-                inputs.append(flipped_tensor)
-                policy_targets.append(flipped_move_idx)
-                flipped_value_target = -value_target
-                value_targets.append(flipped_value_target)
-
-            board.push(move)
+            initargs = (self.min_elo, self.engine_path, self.engine_depth, self.engine_threads, self.engine_hash, stop_event, pause_event, log_queue)
+            # The feeder stays a bounded number of chunks ahead, so little work is queued when collection stops early
+            in_flight = threading.Semaphore(self.num_processes * CHUNKS_IN_FLIGHT_PER_PROCESS)
+            stop_feeding = threading.Event()
+            pool = ctx.Pool(processes=self.num_processes, initializer=_init_chunk_process, initargs=initargs)
+            completed = False
+            try:
+                for results in pool.imap_unordered(_parse_chunk, self._feed_chunks(in_flight, stop_feeding), chunksize=1):
+                    in_flight.release()
+                    for result in results:
+                        if self.total_games_processed >= self.max_games:
+                            break
+                        self._process_data_entry(result)
+                        self.total_games_processed += 1
 
-        return inputs, policy_targets, value_targets
+                    if self.total_games_processed >= self.max_games or self._is_stopped.is_set():
+                        break
+
+                    # UI updates at most every STATS_EMIT_INTERVAL seconds
+                    if time.monotonic() - self.last_emit_time > STATS_EMIT_INTERVAL:
+                        update_progress_time_left(self.progress_update, self.time_left_update, self.start_time, self.total_games_processed, total_estimated_games)
+                        self._emit_stats()
+                else:
+                    # Every chunk was parsed, so the processes can exit on their own
+                    pool.close()
+                    completed = True
+            finally:
+                # Unblock the feeder, then have the processes skip whatever is still queued so they exit
+                # normally and quit their engines, instead of being terminated mid-analysis
+                stop_feeding.set()
+                in_flight.release()
+                if not completed:
+                    stop_event.set()
+                    pause_event.set()
+                    pool.close()
+                pool.join()
+        finally:
+            relay_done.set()
+            relay.join()
+            manager.shutdown()
+
+    def _feed_chunks(self, in_flight: threading.Semaphore, stop_feeding: threading.Event):
+        for start, end in iter_chunks(self.raw_pgn_file):
+            in_flight.acquire()
+            if stop_feeding.is_set():
+                return
+            yield self.raw_pgn_file, start, end
+
+    def _relay_chunk_processes(self, stop_event, pause_event, log_queue, done: threading.Event):
+        # Mirror stop/pause into the parsing processes and forward their logs to the UI
+        while True:
+            finished = done.wait(0.1)
+            if self._is_stopped.is_set():
+                stop_event.set()
+            if self._is_paused.is_set():
+                pause_event.set()
+            else:
+                pause_event.clear()
+            while not log_queue.empty():
+                level, message = log_queue.get()
+                self.log_update.emit(level, message)
+            if finished:
+                break
 
     def _process_data_entry(self, data: dict):
         inputs = data["inputs"]
@@ -252,65 +406,91 @@ class DataPreparationWorker(BaseWorker):
 
         self._update_histograms(game_length, avg_rating)
 
-        self.batch_inputs.extend(inputs)
-        self.batch_policy_targets.extend(policy_targets)
-        self.batch_value_targets.extend(value_targets)
+        fill_end = self.batch_fill + num_new_samples
+        if fill_end > len(self.batch_inputs):
+            self._grow_batch(fill_end)
+        self.batch_inputs[self.batch_fill:fill_end] = inputs
+        self.batch_policy_targets[self.batch_fill:fill_end] = policy_targets
+        self.batch_value_targets[self.batch_fill:fill_end] = value_targets
+        self.batch_fill = fill_end
 
         # If batch is large enough, write to disk
-        if len(self.batch_inputs) >= self.batch_size:
+        if self.batch_fill >= self.batch_size:
             self._write_batch_to_h5()
 
-    def _write_batch_to_h5(self):
+    def _grow_batch(self, min_capacity: int):
+        capacity = max(min_capacity, 2 * len(self.batch_inputs))
+        for name in ("batch_inputs", "batch_policy_targets", "batch_value_targets"):
+            arena = getattr(self, name)
+            grown = np.empty((capacity, *arena.shape[1:]), dtype=arena.dtype)
+            grown[:self.batch_fill] = arena[:self.batch_fill]
+            setattr(self, name, grown)
+
+    def _write_batch_to_h5(self, final: bool = False):
         try:
-            batch_size = len(self.batch_inputs)
+            # Rows past the last whole chunk stay in memory for the next write
+            batch_size = self.batch_fill if final else self.batch_fill // WRITE_ALIGN_ROWS * WRITE_ALIGN_ROWS
+            if batch_size == 0:
+                return
             start_idx = self.current_dataset_size
             end_idx = self.current_dataset_size + batch_size
 
-            # Resize datasets
-            self.h5_inputs.resize((end_idx, 25, 8, 8))
-            self.h5_policy_targets.resize((end_idx,))
-            self.h5_value_targets.resize((end_idx,))
+            # Grow geometrically only when the estimate turns out too small
+            if end_idx > self.dataset_capacity:
+                self.dataset_capacity = max(end_idx, self.dataset_capacity * 2)
+                self._resize_datasets(self.dataset_capacity)
 
             # Write data
-            self.h5_inputs[start_idx:end_idx] = np.array(self.batch_inputs, dtype=np.float32)
-            self.h5_policy_targets[start_idx:end_idx] = np.array(self.batch_policy_targets, dtype=np.int64)
-            self.h5_value_targets[start_idx:end_idx] = np.array(self.batch_value_targets, dtype=np.float32)
+            self.h5_inputs[start_idx:end_idx] = self.batch_inputs[:batch_size]
+            self.h5_policy_targets[start_idx:end_idx] = self.batch_policy_targets[:batch_size]
+            self.h5_value_targets[start_idx:end_idx] = self.batch_value_targets[:batch_size]
 
             # Update dataset size
             self.current_dataset_size += batch_size
 
-            # Clear the in-memory batch
-            self.batch_inputs.clear()
-            self.batch_policy_targets.clear()
-            self.batch_value_targets.clear()
+            # Move the unwritten rows to the front of the arenas
+            remaining = self.batch_fill - batch_size
+            self.batch_inputs[:remaining] = self.batch_inputs[batch_size:self.batch_fill]
+            self.batch_policy_targets[:remaining] = self.batch_policy_targets[batch_size:self.batch_fill]
+            self.batch_value_targets[:remaining] = self.batch_value_targets[batch_size:self.batch_fill]
+            self.batch_fill = remaining
 
         except Exception as e:
             self.logger.error(f"Error writing batch to HDF5: {str(e)}")
 
+    def _resize_datasets(self, size: int):
+        self.h5_inputs.resize((size, 25, 8))
+        self.h5_policy_targets.resize((size,))
+        self.h5_value_targets.resize((size,))
+
     def _update_histograms(self, game_length: int, avg_rating: float):
-        # Update game length histogram
-        length_idx = np.digitize(game_length, self.game_length_bins) - 1
-        if 0 <= length_idx < len(self.game_length_histogram):
-            self.game_length_histogram[length_idx] += 1
+        if self.game_length_count == len(self.game_length_buffer) or self.player_rating_count == len(self.player_rating_buffer):
+            self._flush_histograms()
 
-        # Update player rating histogram
+        self.game_length_buffer[self.game_length_count] = game_length
+        self.game_length_count += 1
         if avg_rating:
-            rating_idx = np.digitize(avg_rating, self.player_rating_bins) - 1
-            if 0 <= rating_idx < len(self.player_rating_histogram):
-                self.player_rating_histogram[rating_idx] += 1
+            self.player_rating_buffer[self.player_rating_count] = avg_rating
+            self.player_rating_count += 1
+
+    def _flush_histograms(self):
+        self.game_length_histogram += self._bin_counts(self.game_length_buffer[:self.game_length_count], self.game_length_bins)
+        self.player_rating_histogram += self._bin_counts(self.player_rating_buffer[:self.player_rating_count], self.player_rating_bins)
+        self.game_length_count = 0
+        self.player_rating_count = 0
+
+    def _bin_counts(self, values: np.ndarray, bins: np.ndarray) -> np.ndarray:
+        # Values outside the bin range are dropped rather than clipped into the edge bins
+        num_bins = len(bins) - 1
+        idx = np.digitize(values, bins) - 1
+        return np.bincount(idx[(idx >= 0) & (idx < num_bins)], minlength=num_bins).astype(np.int32)
 
     def _emit_stats(self):
+        self.last_emit_time = time.monotonic()
+        self._flush_histograms()
         if self.stats_update:
-            stats = {
-                "total_games_processed": self.total_games_processed,
-                "total_moves_processed": self.total_moves_processed,
-                "game_results_counter": self.game_results_counter.copy(),
-                "game_length_bins": self.game_length_bins.tolist(),
-                "game_length_histogram": self.game_length_histogram.tolist(),
-                "player_rating_bins": self.player_rating_bins.tolist(),
-                "player_rating_histogram": self.player_rating_histogram.tolist(),
-            }
-            self.stats_update.emit(stats)
+            # Bins are fixed and owned by the visualization, so only the histogram counts are sent
+            self.stats_update.emit(self.game_length_histogram.tobytes(), self.player_rating_histogram.tobytes(), self.total_games_processed, self.game_results_counter.copy())
 
     def _split_dataset(self):
         try:
@@ -325,19 +505,11 @@ class DataPreparationWorker(BaseWorker):
                     self.logger.warning("No samples to split in the dataset.")
                     return
 
-                indices = np.arange(num_samples)
-                np.random.shuffle(indices)
-
-                train_end = int(num_samples * 0.8)
-                val_end = int(num_samples * 0.9)
-
-                train_indices = indices[:train_end]
-                val_indices = indices[train_end:val_end]
-                test_indices = indices[val_end:]
-
-                np.save(train_indices_path, train_indices)
-                np.save(val_indices_path, val_indices)
-                np.save(test_indices_path, test_indices)
+            # Each sample draws its split independently, so no full index array is shuffled; the saved indices come out sorted
+            split_draws = np.random.default_rng().random(num_samples, dtype=np.float32)
+            np.save(train_indices_path, np.flatnonzero(split_draws < 0.8))
+            np.save(val_indices_path, np.flatnonzero((split_draws >= 0.8) & (split_draws < 0.9)))
+            np.save(test_indices_path, np.flatnonzero(split_draws >= 0.9))
 
             self.logger.info("Split dataset into train/val/test sets.")
 
@@ -0,0 +1,35 @@
+import os
+
+# Target size of one chunk; every chunk is extended to the start of the next game
+CHUNK_BYTES = 256 << 10
+SCAN_BYTES = 64 << 10
+
+# Matches both \n and \r\n line endings, since only a header line starts with [Event
+GAME_BOUNDARY = b"\n[Event "
+
+def iter_chunks(path, target_bytes=CHUNK_BYTES):
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < file_size:
+            end = min(start + target_bytes, file_size)
+            if end < file_size:
+                # Back up so a boundary straddling the target position is still found
+                end = _find_game_start(f, max(start, end - len(GAME_BOUNDARY)), file_size)
+            yield start, end
+            start = end
+
+def _find_game_start(f, pos, file_size):
+    while pos < file_size:
+        f.seek(pos)
+        block = f.read(SCAN_BYTES + len(GAME_BOUNDARY))
+        idx = block.find(GAME_BOUNDARY)
+        if idx != -1:
+            return pos + idx + 1
+        pos += SCAN_BYTES
+    return file_size
+
+def read_chunk(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
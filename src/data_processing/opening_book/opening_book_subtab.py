@@ -1,15 +1,18 @@
 from PyQt5.QtWidgets import QVBoxLayout, QLabel, QGridLayout, QLineEdit, QPushButton, QGroupBox, QMessageBox
-from src.data_processing.opening_book.opening_book_worker import OpeningBookWorker
-from src.data_processing.opening_book.opening_book_visualization import OpeningBookVisualization
 from src.base.base_tab import BaseTab
 import os
+import stat
 
 class OpeningBookSubTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.visualization = OpeningBookVisualization()
         self.init_ui()
 
+    def create_visualization(self):
+        # Matplotlib and NumPy load with the plots the first time they are needed, not at application startup
+        from src.data_processing.opening_book.opening_book_visualization import OpeningBookVisualization
+        return OpeningBookVisualization()
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
         
@@ -19,7 +22,7 @@ class OpeningBookSubTab(BaseTab):
             "Opening Book Generation Progress",
             "Opening Book Generation Logs",
             "Opening Book Visualization",
-            self.visualization,
+            self.create_visualization,
             {
                 "start_text": "Start Opening Book Generation",
                 "stop_text": "Stop",
@@ -36,11 +39,12 @@ class OpeningBookSubTab(BaseTab):
         self.opening_book_group = self.create_opening_book_group()
         self.layout().insertWidget(1, self.opening_book_group)
         
-        self.stop_button.setEnabled(False)
-        if self.pause_button:
-            self.pause_button.setEnabled(False)
-        if self.resume_button:
-            self.resume_button.setEnabled(False)
+        # Widget groups whose state flips together on start and reset
+        self.run_groups = (self.progress_group, self.control_group, self.log_group)
+        self.view_buttons = tuple(button for button in (self.show_logs_button, self.show_graphs_button) if button)
+        self.run_buttons = tuple(button for button in (self.stop_button, self.pause_button, self.resume_button) if button)
+        
+        self.set_widgets_enabled(self.run_buttons, False)
 
     def create_opening_book_group(self):
         group = QGroupBox("Opening Book Configuration")
@@ -72,20 +76,22 @@ class OpeningBookSubTab(BaseTab):
         return group
 
     def start_process(self):
-        try:
-            pgn_file_path = self.pgn_file_input.text().strip()
-            max_games = int(self.ob_max_games_input.text())
-            min_elo = int(self.ob_min_elo_input.text())
-            max_opening_moves = int(self.ob_max_opening_moves_input.text())
-            
-            if not os.path.isfile(pgn_file_path):
-                QMessageBox.warning(self, "Input Error", "The specified PGN file does not exist.")
-                return
-            if max_games <= 0 or min_elo <= 0 or max_opening_moves <= 0:
-                raise ValueError
-        except ValueError:
+        pgn_file_path = self.pgn_file_input.text().strip()
+        max_games, min_elo, max_opening_moves = [self.parse_positive_int(w) for w in (self.ob_max_games_input, self.ob_min_elo_input, self.ob_max_opening_moves_input)]
+        if None in (max_games, min_elo, max_opening_moves):
             QMessageBox.warning(self, "Input Error", "Please ensure all inputs are valid positive integers.")
             return
+        # One stat call both checks the file exists and catches an empty file before the worker starts
+        try:
+            pgn_stat = os.stat(pgn_file_path)
+        except OSError:
+            pgn_stat = None
+        if pgn_stat is None or not stat.S_ISREG(pgn_stat.st_mode):
+            QMessageBox.warning(self, "Input Error", "The specified PGN file does not exist.")
+            return
+        if pgn_stat.st_size == 0:
+            QMessageBox.warning(self, "Input Error", "The specified PGN file is empty.")
+            return
         
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
@@ -98,25 +104,21 @@ class OpeningBookSubTab(BaseTab):
         self.progress_bar.setFormat("Starting...")
         self.remaining_time_label.setText("Time Left: Calculating...")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
         
         self.opening_book_group.setVisible(False)
-        self.progress_group.setVisible(True)
-        self.control_group.setVisible(True)
-        self.log_group.setVisible(True)
+        self.set_widgets_visible(self.run_groups, True)
         
         if self.visualization_group:
             self.visualization_group.setVisible(False)
-        if self.show_logs_button:
-            self.show_logs_button.setVisible(True)
-        if self.show_graphs_button:
-            self.show_graphs_button.setVisible(True)
+        self.set_widgets_visible(self.view_buttons, True)
         if self.start_new_button:
             self.start_new_button.setVisible(False)
         
         self.init_ui_state = False
         
-        started = self.start_worker(OpeningBookWorker, pgn_file_path, max_games, min_elo, max_opening_moves)
+        from src.data_processing.opening_book.opening_book_worker import OpeningBookWorker
+        started = self.start_process_worker(OpeningBookWorker, pgn_file_path, max_games, min_elo, max_opening_moves)
         
         if started:
             self.worker.positions_update.connect(self.visualization.update_opening_book)
@@ -136,10 +138,7 @@ class OpeningBookSubTab(BaseTab):
             self.visualization_group.setVisible(False)
         if self.start_new_button:
             self.start_new_button.setVisible(False)
-        if self.show_logs_button:
-            self.show_logs_button.setVisible(False)
-        if self.show_graphs_button:
-            self.show_graphs_button.setVisible(False)
+        self.set_widgets_visible(self.view_buttons, False)
         if self.show_logs_button:
             self.show_logs_button.setChecked(True)
         if self.show_graphs_button:
@@ -149,15 +148,10 @@ class OpeningBookSubTab(BaseTab):
         self.progress_bar.setFormat("Idle")
         self.remaining_time_label.setText("Time Left: N/A")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
         
         if self.start_button:
             self.start_button.setEnabled(True)
-        if self.stop_button:
-            self.stop_button.setEnabled(False)
-        if self.pause_button:
-            self.pause_button.setEnabled(False)
-        if self.resume_button:
-            self.resume_button.setEnabled(False)
+        self.set_widgets_enabled(self.run_buttons, False)
         
         self.init_ui_state = True
\ No newline at end of file
@@ -1,12 +1,11 @@
 from typing import Dict, Any
-from collections import defaultdict
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
 from src.base.base_visualization import BaseVisualizationWidget, BasePlot
 
 class OpeningBookVisualization(BaseVisualizationWidget):
     def __init__(self, parent: QWidget = None) -> None:
-        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.opening_counts: Dict[str, int] = {}
         self.top_n = 10
         self.plot_key = 'main_plot'
         super().__init__(parent)
@@ -33,21 +32,16 @@ class OpeningBookVisualization(BaseVisualizationWidget):
         self.update_graph()
 
     def reset_visualization(self) -> None:
-        self.positions.clear()
+        self.opening_counts.clear()
         self.update_graph()
 
     def update_opening_book(self, data: Dict[str, Any]) -> None:
-        self.positions = data.get('positions', {})
+        self.opening_counts = data.get('opening_counts', {})
         self.update_graph()
 
     def update_graph(self) -> None:
-        # Aggregate opening names and their occurrence counts
-        opening_counts: Dict[str, int] = defaultdict(int)
-        for fen, moves in self.positions.items():
-            for move, stats in moves.items():
-                opening_name = stats.get('name', 'Unknown')
-                opening_counts[opening_name] += (stats.get('win', 0) + stats.get('draw', 0) + stats.get('loss', 0))
-
+        # The worker sends occurrence counts already aggregated per opening name
+        opening_counts = self.opening_counts
         if not opening_counts:
             self._display_no_data()
             return
@@ -1,12 +1,20 @@
+import io
 import json
+import mmap
 import os
+import re
 import time
-from collections import defaultdict
+from collections import Counter
 import chess.pgn
 from PyQt5.QtCore import pyqtSignal
 from src.base.base_worker import BaseWorker
 from src.utils.common_utils import estimate_total_games, update_progress_time_left, wait_if_paused, determine_outcome
 
+# Byte-level header patterns so low-rated games are rejected before python-chess parses them
+GAME_START_PATTERN = re.compile(rb"^\[Event ", re.M)
+WHITE_ELO_PATTERN = re.compile(rb'^\[WhiteElo "(\d+)"\]', re.M)
+BLACK_ELO_PATTERN = re.compile(rb'^\[BlackElo "(\d+)"\]', re.M)
+
 class OpeningBookWorker(BaseWorker):
     positions_update = pyqtSignal(dict)
 
@@ -16,7 +24,10 @@ class OpeningBookWorker(BaseWorker):
         self.max_games = max_games
         self.min_elo = min_elo
         self.max_opening_moves = max_opening_moves
-        self.positions = defaultdict(lambda: defaultdict(lambda: {"win": 0, "draw": 0, "loss": 0, "eco": "", "name": ""}))
+        # FEN -> UCI move -> outcome counts plus the ECO code and opening name of the first game that reached it
+        self.positions = {}
+        # Opening name -> games summed over its book moves, kept in step with positions for the progress plot
+        self.opening_counts = Counter()
         self.game_counter = 0
         self.start_time = None
 
@@ -27,15 +38,17 @@ class OpeningBookWorker(BaseWorker):
 
             self.logger.info(f"Starting opening book generation from {self.pgn_file_path}.")
 
-            with open(self.pgn_file_path, "r", encoding="utf-8", errors="ignore") as pgn_file:
-                while (self.game_counter < self.max_games and not self._is_stopped.is_set()):
+            with open(self.pgn_file_path, "rb") as pgn_file, mmap.mmap(pgn_file.fileno(), 0, access=mmap.ACCESS_READ) as pgn_map:
+                for start, end in self._iter_game_spans(pgn_map):
+                    if self.game_counter >= self.max_games or self._is_stopped.is_set():
+                        break
                     wait_if_paused(self._is_paused)
 
-                    game = chess.pgn.read_game(pgn_file)
-                    if game is None:
-                        break
+                    if not self._passes_elo_filter(pgn_map, start, end):
+                        continue
 
-                    if not self._process_game(game):
+                    game = chess.pgn.read_game(io.StringIO(pgn_map[start:end].decode("utf-8", errors="ignore")))
+                    if game is None or not self._process_game(game):
                         continue
 
                     self.game_counter += 1
@@ -54,6 +67,22 @@ class OpeningBookWorker(BaseWorker):
         finally:
             self._save_opening_book()
 
+    def _iter_game_spans(self, pgn_map: mmap.mmap):
+        start = None
+        for match in GAME_START_PATTERN.finditer(pgn_map):
+            if start is not None:
+                yield start, match.start()
+            start = match.start()
+        if start is not None:
+            yield start, len(pgn_map)
+
+    def _passes_elo_filter(self, pgn_map: mmap.mmap, start: int, end: int) -> bool:
+        white_match = WHITE_ELO_PATTERN.search(pgn_map, start, end)
+        if white_match is None or int(white_match.group(1)) < self.min_elo:
+            return False
+        black_match = BLACK_ELO_PATTERN.search(pgn_map, start, end)
+        return black_match is not None and int(black_match.group(1)) >= self.min_elo
+
     def _process_game(self, game: chess.pgn.Game) -> bool:
         try:
             white_elo_str = game.headers.get("WhiteElo")
@@ -89,17 +118,27 @@ class OpeningBookWorker(BaseWorker):
 
                 fen = board.fen()
                 uci_move = move.uci()
-                move_data = self.positions[fen][uci_move]
+                moves = self.positions.get(fen)
+                if moves is None:
+                    moves = self.positions[fen] = {}
+                move_data = moves.get(uci_move)
+                if move_data is None:
+                    move_data = moves[uci_move] = {"win": 0, "draw": 0, "loss": 0, "eco": eco_code, "name": opening_name}
 
                 # Update outcome statistics
                 if outcome in {"win", "draw", "loss"}:
                     move_data[outcome] += 1
+                    self.opening_counts[move_data["name"]] += 1
 
-                # Update ECO code and opening name if not already set
+                # Fill in the ECO code and opening name if the first game didn't have them
                 if not move_data["eco"]:
                     move_data["eco"] = eco_code
-                if not move_data["name"]:
+                if not move_data["name"] and opening_name:
                     move_data["name"] = opening_name
+                    # Games counted while the move was unnamed now belong to this opening
+                    move_games = move_data["win"] + move_data["draw"] + move_data["loss"]
+                    self.opening_counts[""] -= move_games
+                    self.opening_counts[opening_name] += move_games
 
                 board.push(move)
                 move_counter += 1
@@ -115,16 +154,16 @@ class OpeningBookWorker(BaseWorker):
 
     def _emit_stats(self):
         if self.positions_update:
-            stats = {"positions": dict(self.positions)}
+            # Only the per-opening totals cross the process boundary, not the whole book
+            stats = {"opening_counts": {name: count for name, count in self.opening_counts.items() if count > 0}}
             self.positions_update.emit(stats)
 
     def _save_opening_book(self):
         try:
-            positions = {fen: {move: stats for move, stats in moves.items()} for fen, moves in self.positions.items()}
             book_file = os.path.abspath(os.path.join("data", "processed", "opening_book.json"))
             os.makedirs(os.path.dirname(book_file), exist_ok=True)
             with open(book_file, "w") as f:
-                json.dump(positions, f, indent=4)
+                json.dump(self.positions, f, indent=4)
             self.logger.info(f"Opening book saved to {book_file}")
         except Exception as e:
             self.logger.error(f"Error saving opening book: {str(e)}")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import torch
 import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 
 class ResidualUnit(nn.Module):
     def __init__(self) -> None:
@@ -72,4 +73,18 @@ class ChessModel(nn.Module):
         x = self.residual_layers(x)
         policy_output = self.policy_head(x)
         value_output = self.value_head(x)
-        return policy_output, value_output
\ No newline at end of file
+        return policy_output, value_output
+
+    def fuse_for_inference(self) -> "ChessModel":
+        # In eval mode BatchNorm is a fixed affine map, so it folds into the preceding convolution's weights and bias
+        for block in (self.initial_block, self.policy_head, self.value_head):
+            block[0], block[1] = fuse_conv_bn_eval(block[0], block[1]), nn.Identity()
+        for unit in self.residual_layers:
+            unit.conv1, unit.norm1 = fuse_conv_bn_eval(unit.conv1, unit.norm1), nn.Identity()
+            unit.conv2, unit.norm2 = fuse_conv_bn_eval(unit.conv2, unit.norm2), nn.Identity()
+        return self
+
+    def quantize_for_cpu(self) -> nn.Module:
+        # The policy head's Linear layer holds most of the weights, so int8 weights with dynamically
+        # quantized activations cover the bulk of CPU inference without calibration data
+        return torch.ao.quantization.quantize_dynamic(self, {nn.Linear}, dtype=torch.qint8)
\ No newline at end of file
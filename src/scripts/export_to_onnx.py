@@ -9,14 +9,15 @@ if __name__ == "__main__":
     num_moves = model_state_dict.get("policy_head.4.weight", torch.empty(8064)).shape[0]
     model = ChessModel(num_moves=num_moves)
     model.load_state_dict(model_state_dict)
-    model.eval()
+    # Export the inference graph with BatchNorm already folded into the convolutions
+    model.eval().fuse_for_inference()
     onnx_path = model_path.replace(".pth", ".onnx")
     torch.onnx.export(
         model,
         torch.randn(1, 25, 8, 8),
         onnx_path,
         export_params=True,
-        opset_version=11,
+        opset_version=17,
         do_constant_folding=True,
         input_names=["input"],
         output_names=["policy_output", "value_output"],
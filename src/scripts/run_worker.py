@@ -0,0 +1,49 @@
+import sys
+import os
+import base64
+import importlib
+import pickle
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from PyQt5.QtCore import Qt, pyqtSignal
+
+output_lock = threading.Lock()
+
+def send_signal(name, values):
+    # One base64-encoded pickle per line so the parent can split the stream on newlines
+    line = base64.b64encode(pickle.dumps((name, values))).decode("ascii")
+    with output_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+def listen_for_commands(worker):
+    for line in sys.stdin:
+        command = line.strip()
+        if command == "pause":
+            worker.pause()
+        elif command == "resume":
+            worker.resume()
+        elif command == "stop":
+            worker.stop()
+
+    # The parent closed our stdin, so nobody is listening anymore
+    worker.stop()
+
+if __name__ == "__main__":
+    module_name, class_name = sys.argv[1].split(":")
+    args = pickle.loads(base64.b64decode(sys.argv[2]))
+
+    # Keep the GUI process ahead of us when cores are contended
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+    worker_class = getattr(importlib.import_module(module_name), class_name)
+    worker = worker_class(*args)
+
+    # Forward every signal of the worker to the parent process
+    for name in dir(worker_class):
+        if isinstance(getattr(worker_class, name), pyqtSignal):
+            getattr(worker, name).connect(lambda *values, name=name: send_signal(name, values), Qt.DirectConnection)
+
+    threading.Thread(target=listen_for_commands, args=(worker,), daemon=True).start()
+    worker.run()
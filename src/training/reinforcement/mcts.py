@@ -3,6 +3,7 @@ import numpy as np
 import threading
 import chess
 import torch
+from torch.amp import autocast
 from src.utils.common_utils import get_game_result
 from src.utils.chess_utils import convert_board_to_tensor, get_move_mapping
 
@@ -16,11 +17,12 @@ class TreeNode:
         self.P = prior_p
         self.board = board
         self.move = move
+        self.virtual_loss = 0
 
     def expand(self, action_priors):
         for mv, prob in action_priors.items():
             if mv not in self.children and prob > 0.0:
-                next_board = self.board.copy()
+                next_board = self.board.copy(stack=False)
                 next_board.push(mv)
                 self.children[mv] = TreeNode(self, prob, next_board, mv)
 
@@ -40,84 +42,112 @@ class TreeNode:
         return len(self.children) == 0
 
     def get_value(self, c_puct):
+        # Pending simulations count as losses so parallel searches spread out
+        n_visits = self.n_visits + self.virtual_loss
+        q = (self.Q * self.n_visits - self.virtual_loss) / n_visits if n_visits > 0 else self.Q
         if self.parent:
-            parent_visits = self.parent.n_visits
-            self.u = c_puct * self.P * math.sqrt(parent_visits) / (1 + self.n_visits)
-        return self.Q + self.u
+            parent_visits = self.parent.n_visits + self.parent.virtual_loss
+            self.u = c_puct * self.P * math.sqrt(parent_visits) / (1 + n_visits)
+        return q + self.u
 
 class MCTS:
-    def __init__(self, model, device, c_puct=1.4, n_simulations=800):
+    def __init__(self, model, device, c_puct=1.4, n_simulations=800, inference_server=None, leaf_batch_size=16):
         self.root = None
         self.model = model
         self.device = device
         self.c_puct = c_puct
         self.n_simulations = n_simulations
+        self.inference_server = inference_server
+        self.leaf_batch_size = leaf_batch_size
+        # Input planes reused by every forward that doesn't go through the inference server
+        self.input_buffer = np.empty((leaf_batch_size, 25, 8, 8), dtype=np.float32)
         self.tree_lock = threading.Lock()
+        self.move_mapping = get_move_mapping()
 
     def _policy_value_fn(self, board: chess.Board):
-        board_tensor = convert_board_to_tensor(board)
-        board_tensor = torch.from_numpy(board_tensor).float().unsqueeze(0).to(self.device)
+        return self._policy_value_batch([board])[0]
 
-        with torch.no_grad():
-            policy_logits, value_out = self.model(board_tensor)
-            policy_logits = policy_logits[0]
-            value_float = value_out.item()
+    def _policy_value_batch(self, boards):
+        if self.inference_server is not None:
+            # Batched together with leaves from other search threads
+            futures = [self.inference_server.submit(convert_board_to_tensor(board)) for board in boards]
+            outputs = [future.result() for future in futures]
+            policy_logits = torch.stack([policy for policy, _ in outputs])
+            value_out = torch.stack([value for _, value in outputs])
+        else:
+            if len(boards) > len(self.input_buffer):
+                self.input_buffer = np.empty((len(boards), 25, 8, 8), dtype=np.float32)
+            board_tensors = self.input_buffer[:len(boards)]
+            for board, planes in zip(boards, board_tensors):
+                convert_board_to_tensor(board, out=planes)
+            inputs = torch.from_numpy(board_tensors).to(self.device).contiguous(memory_format=torch.channels_last)
+            # Only the ranking of the priors and the sign of the value matter here, so half precision is plenty
+            with torch.inference_mode(), autocast("cuda", dtype=torch.float16, enabled=(self.device.type == "cuda")):
+                policy_logits, value_out = self.model(inputs)
 
-        policy = torch.softmax(policy_logits, dim=0).cpu().numpy()
-        legal_moves = list(board.legal_moves)
+        policies = torch.softmax(policy_logits.float(), dim=1).cpu().numpy()
+        values = value_out.float().flatten().tolist()
+        return [(self._legal_move_priors(board, policy), value) for board, policy, value in zip(boards, policies, values)]
 
+    def _legal_move_priors(self, board: chess.Board, policy: np.ndarray):
+        legal_moves = list(board.legal_moves)
         if not legal_moves:
-            return {}, value_float
-
-        action_probs = {}
-        total_prob = 0.0
-        move_mapping = get_move_mapping()
-
-        for mv in legal_moves:
-            idx = move_mapping.get_index_by_move(mv)
-            if idx is not None and idx < len(policy):
-                prob = max(policy[idx], 1e-8)
-                action_probs[mv] = prob
-                total_prob += prob
-            else:
-                action_probs[mv] = 1e-8
-                total_prob += 1e-8
+            return {}
 
-        if total_prob > 0:
-            for mv in action_probs:
-                action_probs[mv] /= total_prob
-        else:
-            uniform = 1.0 / len(legal_moves)
-            for mv in action_probs:
-                action_probs[mv] = uniform
+        # Gather the priors of all legal moves at once; unmapped moves get the same floor as vanishing priors
+        idxs = np.fromiter((self.move_mapping.INDEX_MAPPING.get(mv, -1) for mv in legal_moves), dtype=np.int64, count=len(legal_moves))
+        mapped = (idxs >= 0) & (idxs < len(policy))
+        probs = np.full(len(legal_moves), 1e-8, dtype=np.float32)
+        probs[mapped] = np.maximum(policy[idxs[mapped]], 1e-8)
+        probs /= probs.sum()
 
-        return action_probs, value_float
+        return dict(zip(legal_moves, probs))
 
     def set_root_node(self, board: chess.Board):
-        self.root = TreeNode(None, 1.0, board.copy(), None)
+        # Search nodes never pop moves, so the move stack is not copied
+        self.root = TreeNode(None, 1.0, board.copy(stack=False), None)
         action_probs, _ = self._policy_value_fn(board)
         self.root.expand(action_probs)
 
-    def simulate(self):
-        node = self.root
+    def simulate_batch(self, batch_size):
+        # Selection of a batch of leaves, with virtual loss along each path so they spread over the tree
+        paths = []
+        with self.tree_lock:
+            for _ in range(batch_size):
+                node = self.root
+                path = [node]
+                while not node.is_leaf():
+                    _, node = node.select(self.c_puct)
+                    path.append(node)
+                for path_node in path:
+                    path_node.virtual_loss += 1
+                paths.append(path)
 
-        # Selection
-        while not node.is_leaf():
-            _, node = node.select(self.c_puct)
+        # Evaluation of every distinct non-terminal leaf in one forward (outside the lock so other threads can select meanwhile)
+        leaves = {id(path[-1]): path[-1] for path in paths}
+        terminal = {leaf_id for leaf_id, leaf in leaves.items() if leaf.board.is_game_over()}
+        pending = [leaf for leaf_id, leaf in leaves.items() if leaf_id not in terminal]
+        evaluations = dict(zip(map(id, pending), self._policy_value_batch([leaf.board for leaf in pending]))) if pending else {}
 
-        # Expansion & Evaluation
-        action_probs, leaf_value = self._policy_value_fn(node.board)
-        if not node.board.is_game_over():
-            node.expand(action_probs)
-        else:
-            leaf_value = get_game_result(node.board)
+        with self.tree_lock:
+            for path in paths:
+                node = path[-1]
+                for path_node in path:
+                    path_node.virtual_loss -= 1
+
+                # Expansion
+                if id(node) in terminal:
+                    leaf_value = get_game_result(node.board)
+                else:
+                    action_probs, leaf_value = evaluations[id(node)]
+                    node.expand(action_probs)
 
-        # Backpropagation
-        node.update_recursive(-leaf_value)
+                # Backpropagation
+                node.update_recursive(-leaf_value)
 
     def get_move_probs(self, temperature=1e-3):
-        for _ in range(self.n_simulations):
-            self.simulate()
+        for start in range(0, self.n_simulations, self.leaf_batch_size):
+            self.simulate_batch(min(self.leaf_batch_size, self.n_simulations - start))
 
         if not self.root.children:
             return {}
@@ -144,4 +174,215 @@ class MCTS:
         else:
             new_board = self.root.board.copy()
             new_board.push(last_move)
-            self.set_root_node(new_board)
\ No newline at end of file
+            self.set_root_node(new_board)
+
+
+class BatchedMCTS:
+    # Upper bound on legal moves in any chess position
+    MAX_ACTIONS = 218
+
+    def __init__(self, model, device, c_puct=1.4, n_simulations=800, inference_server=None, capacity=1024):
+        self.model = model
+        self.device = torch.device(device)
+        self.c_puct = c_puct
+        self.n_simulations = n_simulations
+        self.inference_server = inference_server
+        self.capacity = capacity
+        self.move_mapping = get_move_mapping()
+        self.num_nodes = 0
+
+    def set_root_node(self, board: chess.Board):
+        # Edge statistics live on the device; boards and move lists stay on the host
+        self.num_nodes = 0
+        self.N = torch.zeros((self.capacity, self.MAX_ACTIONS), dtype=torch.float32, device=self.device)
+        self.W = torch.zeros_like(self.N)
+        self.P = torch.zeros_like(self.N)
+        self.children = torch.full((self.capacity, self.MAX_ACTIONS), -1, dtype=torch.long, device=self.device)
+        self.num_actions = torch.zeros(self.capacity, dtype=torch.long, device=self.device)
+        # Value of each node from its side to move: the network's estimate, or the outcome of a finished game
+        self.V = torch.zeros(self.capacity, dtype=torch.float32, device=self.device)
+        self.boards = []
+        self.moves = []
+        self.terminal_values = []
+        # Node depths stay on the host, so selection knows how many levels to descend without asking the device
+        self.depths = []
+        self.max_depth = 0
+
+        root = self._add_nodes([board.copy(stack=False)], [0])
+        self._evaluate_and_expand(root)
+
+    def simulate_batch(self, batch_size=64):
+        if not self.moves[0]:
+            return
+
+        nodes = torch.zeros(batch_size, dtype=torch.long, device=self.device)
+        active = torch.ones(batch_size, dtype=torch.bool, device=self.device)
+        leaf_parents = torch.full((batch_size,), -1, dtype=torch.long, device=self.device)
+        leaf_actions = torch.full((batch_size,), -1, dtype=torch.long, device=self.device)
+        slots = torch.arange(self.MAX_ACTIONS, device=self.device)
+        path_nodes, path_actions, path_active = [], [], []
+
+        # Selection: every in-flight simulation descends one level per step. No path is longer than the tree is
+        # deep, so the loop runs a fixed number of steps and finished simulations are masked instead of polled
+        for _ in range(self.max_depth + 1):
+            num_actions = self.num_actions[nodes]
+            active = active & (num_actions > 0)
+
+            n, w, p = self.N[nodes], self.W[nodes], self.P[nodes]
+            q = torch.where(n > 0, w / n.clamp(min=1.0), torch.zeros_like(w))
+            u = self.c_puct * p * torch.sqrt(n.sum(dim=1, keepdim=True)) / (1.0 + n)
+            scores = (q + u).masked_fill(slots >= num_actions.unsqueeze(1), float("-inf"))
+
+            # Simulations sharing a node take its next-best actions so the batch spreads over the tree
+            rank = torch.minimum(self._rank_within_node(torch.where(active, nodes, -1)), (num_actions - 1).clamp(min=0))
+            actions = scores.argsort(dim=1, descending=True).gather(1, rank.unsqueeze(1)).squeeze(1)
+
+            path_nodes.append(nodes)
+            path_actions.append(actions)
+            path_active.append(active)
+
+            children = self.children[nodes, actions]
+            at_leaf = active & (children < 0)
+            leaf_parents = torch.where(at_leaf, nodes, leaf_parents)
+            leaf_actions = torch.where(at_leaf, actions, leaf_actions)
+            active = active & ~at_leaf
+            nodes = torch.where(active, children, nodes)
+
+        # Expansion: create one node per distinct unexpanded edge. The boards live on the host, so this is the
+        # one point where the selected edges are copied back
+        leaf_parents_list, leaf_actions_list = torch.stack([leaf_parents, leaf_actions]).tolist()
+        new_edges = list(dict.fromkeys((parent, action) for parent, action in zip(leaf_parents_list, leaf_actions_list) if parent >= 0))
+        new_boards = []
+        for parent, action in new_edges:
+            board = self.boards[parent].copy(stack=False)
+            board.push(self.moves[parent][action])
+            new_boards.append(board)
+        new_nodes = self._add_nodes(new_boards, [self.depths[parent] + 1 for parent, _ in new_edges])
+        if new_edges:
+            edge_parents, edge_actions = zip(*new_edges)
+            self.children[torch.tensor(edge_parents, device=self.device), torch.tensor(edge_actions, device=self.device)] = torch.tensor(new_nodes, device=self.device)
+
+        # Evaluation: new leaves go through the network, terminal nodes already hold the game outcome
+        self._evaluate_and_expand(new_nodes)
+        expanded = leaf_parents >= 0
+        leaf_nodes = torch.where(expanded, self.children[leaf_parents.clamp(min=0), leaf_actions.clamp(min=0)], nodes)
+        leaf_values = self.V[leaf_nodes]
+
+        # Backpropagation: edge values alternate sign from the leaf back up to the root
+        path_nodes = torch.stack(path_nodes)
+        path_actions = torch.stack(path_actions)
+        path_active = torch.stack(path_active)
+        depth = path_active.sum(dim=0)
+        steps_to_leaf = depth.unsqueeze(0) - 1 - torch.arange(path_nodes.shape[0], device=self.device).unsqueeze(1)
+        signs = torch.where(steps_to_leaf % 2 == 0, -1.0, 1.0)
+        # Steps after a simulation stopped add zero instead of being filtered out, which would need their count
+        visits = path_active.float()
+        values = signs * leaf_values.unsqueeze(0) * visits
+        index = (path_nodes.flatten(), path_actions.flatten())
+        self.N.index_put_(index, visits.flatten(), accumulate=True)
+        self.W.index_put_(index, values.flatten(), accumulate=True)
+
+    def get_move_probs(self, temperature=1e-3):
+        root_moves = self.moves[0] if self.moves else []
+        if not root_moves:
+            return {}
+
+        visits = self.N[0, :len(root_moves)].cpu().numpy()
+        if visits.sum() == 0:
+            visits = self.P[0, :len(root_moves)].cpu().numpy()
+
+        if temperature <= 1e-3:
+            # Deterministic: pick the move with highest visit count
+            probs = np.zeros_like(visits)
+            probs[np.argmax(visits)] = 1.0
+        else:
+            # Softmax over visit counts
+            visits_exp = np.exp((visits - np.max(visits)) / temperature)
+            probs = visits_exp / visits_exp.sum()
+
+        return dict(zip(root_moves, probs))
+
+    def _rank_within_node(self, keys: torch.Tensor) -> torch.Tensor:
+        # Fixed-size ops only (no unique/repeat_interleave), so ranking never waits on the device
+        order = torch.argsort(keys, stable=True)
+        sorted_keys = keys[order]
+        positions = torch.arange(keys.shape[0], device=keys.device)
+        group_start = torch.ones_like(sorted_keys, dtype=torch.bool)
+        group_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        starts = torch.cummax(torch.where(group_start, positions, 0), dim=0).values
+        rank = torch.empty_like(order)
+        rank[order] = positions - starts
+        return rank
+
+    def _add_nodes(self, boards, depths):
+        first = self.num_nodes
+        needed = first + len(boards)
+        if needed > self.capacity:
+            extra = max(self.capacity, needed - self.capacity)
+            self.N = torch.cat([self.N, torch.zeros((extra, self.MAX_ACTIONS), dtype=self.N.dtype, device=self.device)])
+            self.W = torch.cat([self.W, torch.zeros_like(self.N[:extra])])
+            self.P = torch.cat([self.P, torch.zeros_like(self.N[:extra])])
+            self.children = torch.cat([self.children, torch.full((extra, self.MAX_ACTIONS), -1, dtype=torch.long, device=self.device)])
+            self.num_actions = torch.cat([self.num_actions, torch.zeros(extra, dtype=torch.long, device=self.device)])
+            self.V = torch.cat([self.V, torch.zeros(extra, dtype=self.V.dtype, device=self.device)])
+            self.capacity += extra
+
+        for board in boards:
+            self.boards.append(board)
+            if board.is_game_over():
+                # From the side to move: being checkmated is a loss, anything else a draw
+                self.moves.append([])
+                self.terminal_values.append(-1.0 if board.is_checkmate() else 0.0)
+            else:
+                self.moves.append(list(board.legal_moves))
+                self.terminal_values.append(None)
+        if boards:
+            self.V[first:needed] = torch.tensor([value or 0.0 for value in self.terminal_values[first:needed]], device=self.device)
+        self.depths.extend(depths)
+        self.max_depth = max([self.max_depth, *depths])
+        self.num_nodes = needed
+        return list(range(first, needed))
+
+    def _evaluate_and_expand(self, nodes):
+        # Terminal nodes got their values when they were added; the rest are evaluated here
+        pending = [node for node in nodes if self.terminal_values[node] is None]
+        if not pending:
+            return
+
+        boards = [self.boards[node] for node in pending]
+        policy_logits, value_out = self._infer([convert_board_to_tensor(board) for board in boards])
+
+        # Gather each node's legal logits into a padded (nodes, MAX_ACTIONS) block and softmax per row
+        idx = np.zeros((len(pending), self.MAX_ACTIONS), dtype=np.int64)
+        valid = np.zeros((len(pending), self.MAX_ACTIONS), dtype=bool)
+        uniform = np.zeros(len(pending), dtype=bool)
+        for row, node in enumerate(pending):
+            legal_moves = self.moves[node]
+            move_idxs = np.fromiter((self.move_mapping.INDEX_MAPPING.get(move, -1) for move in legal_moves), dtype=np.int64, count=len(legal_moves))
+            mapped = move_idxs >= 0
+            idx[row, :len(legal_moves)] = np.where(mapped, move_idxs, 0)
+            valid[row, :len(legal_moves)] = mapped if mapped.any() else True
+            uniform[row] = not mapped.any()
+
+        gathered = policy_logits.gather(1, torch.from_numpy(idx).to(self.device))
+        gathered = gathered.masked_fill(torch.from_numpy(uniform).to(self.device).unsqueeze(1), 0.0)
+        priors = torch.softmax(gathered.masked_fill(~torch.from_numpy(valid).to(self.device), float("-inf")), dim=1)
+
+        node_ids = torch.tensor(pending, device=self.device)
+        self.P[node_ids] = priors
+        self.num_actions[node_ids] = torch.tensor([len(self.moves[node]) for node in pending], device=self.device)
+        self.V[node_ids] = value_out.flatten()
+
+    def _infer(self, board_tensors):
+        if self.inference_server is not None:
+            # Submit every leaf at once so the server can batch them together
+            futures = [self.inference_server.submit(board_tensor) for board_tensor in board_tensors]
+            outputs = [future.result() for future in futures]
+            policy_logits = torch.stack([policy for policy, _ in outputs]).to(self.device)
+            value_out = torch.stack([value for _, value in outputs]).to(self.device)
+            return policy_logits, value_out
+
+        inputs = torch.from_numpy(np.stack(board_tensors)).to(self.device, dtype=next(self.model.parameters()).dtype)
+        with torch.no_grad():
+            policy_logits, value_out = self.model(inputs)
+        return policy_logits.float(), value_out.float()
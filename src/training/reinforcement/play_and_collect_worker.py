@@ -17,10 +17,12 @@ class PlayAndCollectWorker:
         return worker.run()
 
     def __init__(self, args: Tuple):
-        (self.model_state_dict, self.device_type, self.simulations, self.c_puct, self.temperature, self.games_per_process, self.stop_event, self.pause_event, self.seed, self.stats_queue) = args
+        (self.model_state_dict, self.device_type, self.simulations, self.c_puct, self.temperature, self.games_per_process, self.stop_event, self.pause_event, self.seed, self.stats_queue, self.num_intra_op_threads) = args
 
     def run(self) -> Tuple[List[np.ndarray], List[np.ndarray], List[float], List[float], List[int], List[chess.pgn.Game]]:
         initialize_random_seeds(self.seed)
+        # Self-play processes run side by side, so each gets its share of the cores instead of all of them
+        torch.set_num_threads(self.num_intra_op_threads)
         device = torch.device(self.device_type)
         total_moves = get_total_moves()
 
@@ -32,7 +34,10 @@ class PlayAndCollectWorker:
             self.stats_queue.put({"error": f"Failed to load state_dict in worker: {str(e)}"})
             return ([], [], [], [], [], [])
 
-        model.eval()
+        model.eval().fuse_for_inference()
+        if device.type == "cuda":
+            # Self-play evaluates one position per forward, so let the convolutions use NHWC Tensor Core kernels
+            model.to(memory_format=torch.channels_last)
 
         inputs_list, policy_targets_list, value_targets_list, results_list, game_lengths_list, pgn_games_list = [], [], [], [], [], []
 
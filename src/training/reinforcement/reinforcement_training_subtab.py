@@ -1,15 +1,17 @@
 from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QGridLayout, QLineEdit, QPushButton, QLabel, QCheckBox, QComboBox, QMessageBox, QHBoxLayout
-from src.training.reinforcement.reinforcement_training_worker import ReinforcementWorker
-from src.training.reinforcement.reinforcement_training_visualization import ReinforcementVisualization
 from src.base.base_tab import BaseTab
 import os
 
 class ReinforcementTrainingSubTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.visualization = ReinforcementVisualization()
         self.init_ui()
 
+    def create_visualization(self):
+        # Matplotlib and NumPy load with the plots the first time they are needed, not at application startup
+        from src.training.reinforcement.reinforcement_training_visualization import ReinforcementVisualization
+        return ReinforcementVisualization()
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
         self.setup_subtab(
@@ -18,7 +20,7 @@ class ReinforcementTrainingSubTab(BaseTab):
             "Self-Play Progress",
             "Self-Play Logs",
             "Self-Play Visualization",
-            self.visualization,
+            self.create_visualization,
             {
                 "start_text": "Start Self-Play",
                 "stop_text": "Stop Self-Play",
@@ -314,6 +316,7 @@ class ReinforcementTrainingSubTab(BaseTab):
 
         self.init_ui_state = False
 
+        from src.training.reinforcement.reinforcement_training_worker import ReinforcementWorker
         started = self.start_worker(
             ReinforcementWorker,
             model_path=model_path,
@@ -392,7 +395,7 @@ class ReinforcementTrainingSubTab(BaseTab):
         self.progress_bar.setFormat("Idle")
         self.remaining_time_label.setText("Time Left: N/A")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
 
         if self.start_button:
             self.start_button.setEnabled(True)
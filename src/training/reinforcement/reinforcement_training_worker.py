@@ -13,7 +13,7 @@ from multiprocessing import Pool, cpu_count, Manager
 from PyQt5.QtCore import pyqtSignal
 from src.base.base_worker import BaseWorker
 from src.models.model import ChessModel
-from src.utils.chess_utils import get_total_moves
+from src.utils.chess_utils import BOARD_ENCODING_VERSION, get_total_moves
 from src.utils.common_utils import format_time_left, update_progress_time_left
 from src.utils.train_utils import initialize_optimizer, initialize_random_seeds, initialize_scheduler, train_epoch
 from src.utils.checkpoint_manager import CheckpointManager
@@ -224,7 +224,8 @@ class ReinforcementWorker(BaseWorker):
                 "total_games_played": self.total_games_played,
                 "results": self.results,
                 "game_lengths": self.game_lengths,
-            }
+            },
+            "board_encoding_version": BOARD_ENCODING_VERSION
         }
         try:
             torch.save(checkpoint, final_path)
@@ -254,13 +255,14 @@ class ReinforcementWorker(BaseWorker):
 
         stats_queue = manager.Queue()
         seeds = [self.random_seed + i + int(time.time()) for i in range(num_processes)]
+        num_intra_op_threads = max(cpu_count() // num_processes, 1)
 
         # Prepare arguments for each subprocess
         self.model_state_dict = { k: v.cpu() for k, v in self.model.state_dict().items() }
         tasks = []
         for i in range(num_processes):
             gpp = games_per_process + (1 if i < remainder else 0)
-            tasks.append((self.model_state_dict, self.device.type, self.simulations, self.c_puct, self.temperature, gpp, stop_event, pause_event, seeds[i], stats_queue))
+            tasks.append((self.model_state_dict, self.device.type, self.simulations, self.c_puct, self.temperature, gpp, stop_event, pause_event, seeds[i], stats_queue, num_intra_op_threads))
 
         with Pool(processes=num_processes) as pool:
             results = pool.map(PlayAndCollectWorker.run_process, tasks)
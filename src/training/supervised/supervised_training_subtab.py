@@ -1,15 +1,17 @@
 from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QGridLayout, QLineEdit, QPushButton, QLabel, QCheckBox, QComboBox, QMessageBox, QHBoxLayout
-from src.training.supervised.supervised_training_worker import SupervisedWorker
-from src.training.supervised.supervised_training_visualization import SupervisedVisualization
 from src.base.base_tab import BaseTab
 import os
 
 class SupervisedTrainingSubTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.visualization = SupervisedVisualization()
         self.init_ui()
 
+    def create_visualization(self):
+        # Matplotlib and NumPy load with the plots the first time they are needed, not at application startup
+        from src.training.supervised.supervised_training_visualization import SupervisedVisualization
+        return SupervisedVisualization()
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
         self.setup_subtab(
@@ -18,7 +20,7 @@ class SupervisedTrainingSubTab(BaseTab):
             "Training Progress",
             "Training Logs",
             "Training Visualization",
-            self.visualization,
+            self.create_visualization,
             {
                 "start_text": "Start Training",
                 "stop_text": "Stop Training",
@@ -297,6 +299,7 @@ class SupervisedTrainingSubTab(BaseTab):
             self.reset_to_initial_state()
             return
 
+        from src.training.supervised.supervised_training_worker import SupervisedWorker
         started = self.start_worker(
             SupervisedWorker,
             epochs=epochs,
@@ -329,7 +332,7 @@ class SupervisedTrainingSubTab(BaseTab):
             self.reset_to_initial_state()
 
         if not model_path:
-            self.visualization.reset_visualization()
+            self.reset_visualization()
 
     def stop_training(self):
         self.stop_worker()
@@ -375,7 +378,7 @@ class SupervisedTrainingSubTab(BaseTab):
         self.progress_bar.setFormat("Idle")
         self.remaining_time_label.setText("Time Left: N/A")
         self.log_text_edit.clear()
-        self.visualization.reset_visualization()
+        self.reset_visualization()
 
         if self.start_button:
             self.start_button.setEnabled(True)
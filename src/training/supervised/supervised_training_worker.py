@@ -11,7 +11,7 @@ from src.models.model import ChessModel
 from src.utils.datasets import H5Dataset
 from src.utils.common_utils import format_time_left
 from src.utils.train_utils import initialize_optimizer, initialize_scheduler, initialize_random_seeds, validate_epoch, train_epoch
-from src.utils.chess_utils import get_total_moves
+from src.utils.chess_utils import BOARD_ENCODING_VERSION, get_total_moves
 from src.utils.checkpoint_manager import CheckpointManager
 
 class SupervisedWorker(BaseWorker):
@@ -179,7 +179,8 @@ class SupervisedWorker(BaseWorker):
                         "scheduler_state_dict": self.scheduler.state_dict() if self.scheduler else None,
                         "epoch": epoch,
                         "batch_idx": self.total_batches_processed,
-                        "training_stats": {}
+                        "training_stats": {},
+                        "board_encoding_version": BOARD_ENCODING_VERSION
                     }
                     torch.save(checkpoint, final_path)
                     self.logger.info(f"Final model saved at {final_path}")
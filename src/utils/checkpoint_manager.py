@@ -1,6 +1,7 @@
 import os
 import time
 import torch
+from src.utils.chess_utils import BOARD_ENCODING_VERSION
 
 class CheckpointManager:
     def __init__(self, checkpoint_dir, checkpoint_type='epoch', checkpoint_interval=5, logger=None):
@@ -29,6 +30,7 @@ class CheckpointManager:
         final_path = os.path.join(self.checkpoint_dir, final_name)
 
         try:
+            checkpoint_data.setdefault('board_encoding_version', BOARD_ENCODING_VERSION)
             torch.save(checkpoint_data, temp_path)
             os.replace(temp_path, final_path)
             if self.logger:
@@ -53,6 +55,8 @@ class CheckpointManager:
         try:
             checkpoint = torch.load(checkpoint_path, map_location=device)
             model.load_state_dict(checkpoint['model_state_dict'])
+            if checkpoint.get('board_encoding_version', 1) != BOARD_ENCODING_VERSION and self.logger:
+                self.logger.warning(f"Checkpoint {checkpoint_path} was trained on board encoding version {checkpoint.get('board_encoding_version', 1)}, inputs now use version {BOARD_ENCODING_VERSION}.")
 
             if optimizer and 'optimizer_state_dict' in checkpoint:
                 optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
@@ -22,6 +22,12 @@ class MoveMapping:
         self.INDEX_MAPPING = {move: idx for idx, move in self.MOVE_MAPPING.items()}
         self.TOTAL_MOVES = len(moves)
 
+        # Index of each move's mirror image across the middle of the board (-1 if it has none)
+        self.MIRROR_INDEX = np.array([
+            self.INDEX_MAPPING.get(chess.Move(chess.square_mirror(move.from_square), chess.square_mirror(move.to_square), promotion=move.promotion), -1)
+            for move in moves
+        ], dtype=np.int64)
+
     def get_move_by_index(self, index):
         return self.MOVE_MAPPING.get(index)
 
@@ -48,32 +54,85 @@ def flip_move(move):
         promotion=move.promotion
     )
 
-def convert_board_to_tensor(board):
-    planes = np.zeros((25, 8, 8), dtype=np.float32)
-    piece_map = board.piece_map()
-
-    # Map (piece_type, color) to plane index
-    piece_type_indices = {
-        (chess.PAWN,   chess.WHITE): 0,
-        (chess.KNIGHT, chess.WHITE): 1,
-        (chess.BISHOP, chess.WHITE): 2,
-        (chess.ROOK,   chess.WHITE): 3,
-        (chess.QUEEN,  chess.WHITE): 4,
-        (chess.KING,   chess.WHITE): 5,
-        (chess.PAWN,   chess.BLACK): 6,
-        (chess.KNIGHT, chess.BLACK): 7,
-        (chess.BISHOP, chess.BLACK): 8,
-        (chess.ROOK,   chess.BLACK): 9,
-        (chess.QUEEN,  chess.BLACK): 10,
-        (chess.KING,   chess.BLACK): 11,
-    }
-
-    # 1) Encode piece positions
-    for sq, piece in piece_map.items():
-        idx = piece_type_indices.get((piece.piece_type, piece.color))
-        if idx is not None:
-            row, col = divmod(sq, 8)
-            planes[idx, row, col] = 1.0
+# Version of the planes convert_board_to_tensor produces, recorded in datasets and checkpoints.
+# 1: plane 24 (black passed pawns) was always empty; 2: black passed pawns are encoded
+BOARD_ENCODING_VERSION = 2
+
+# Plane order of a mirrored board: every per-color plane swaps with its opposite color's plane
+MIRROR_PLANES = np.array([6, 7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 14, 15, 12, 13, 16, 17, 18, 19, 20, 22, 21, 24, 23])
+# Planes holding one value at [0, 0] instead of a map of squares, so their rows are not mirrored
+SCALAR_PLANES = np.array([12, 13, 14, 15, 17, 18, 19, 20])
+
+def flip_board_tensor(planes):
+    # Tensor of flip_board(board), derived from the tensor of board without re-encoding it
+    flipped = planes[MIRROR_PLANES, ::-1, :]
+    flipped[SCALAR_PLANES] = planes[MIRROR_PLANES[SCALAR_PLANES]]
+    flipped[19, 0, 0] = 1.0 - planes[19, 0, 0]
+    # A mirrored board starts without a move stack, so it is never a repetition
+    flipped[20, 0, 0] = 0.0
+    return flipped
+
+# Map (piece_type, color) to plane index
+PIECE_PLANES = {
+    (chess.PAWN,   chess.WHITE): 0,
+    (chess.KNIGHT, chess.WHITE): 1,
+    (chess.BISHOP, chess.WHITE): 2,
+    (chess.ROOK,   chess.WHITE): 3,
+    (chess.QUEEN,  chess.WHITE): 4,
+    (chess.KING,   chess.WHITE): 5,
+    (chess.PAWN,   chess.BLACK): 6,
+    (chess.KNIGHT, chess.BLACK): 7,
+    (chess.BISHOP, chess.BLACK): 8,
+    (chess.ROOK,   chess.BLACK): 9,
+    (chess.QUEEN,  chess.BLACK): 10,
+    (chess.KING,   chess.BLACK): 11,
+}
+
+# (piece_type, color) pairs in plane order
+PIECE_PLANE_KEYS = sorted(PIECE_PLANES, key=PIECE_PLANES.get)
+
+def convert_board_to_tensor(board, out=None):
+    # Reuse the caller's buffer when given one instead of allocating per position
+    if out is None:
+        planes = np.zeros((25, 8, 8), dtype=np.float32)
+    else:
+        planes = out
+
+    # 1) Encode piece positions: bit sq of each bitboard is square (row, col) = divmod(sq, 8)
+    masks = np.array([board.pieces_mask(piece_type, color) for piece_type, color in PIECE_PLANE_KEYS], dtype="<u8")
+    planes[:12] = np.unpackbits(masks.view(np.uint8), bitorder="little").reshape(12, 8, 8)
+
+    encode_feature_planes(board, planes)
+    return planes
+
+def update_piece_planes(planes, move):
+    # Apply one move to the piece planes (0-11) of the position it was played from
+    from_row, from_col = divmod(move.from_square, 8)
+    to_row, to_col = divmod(move.to_square, 8)
+    idx = int(planes[:12, from_row, from_col].argmax())
+    color = chess.WHITE if idx < 6 else chess.BLACK
+    is_capture = planes[:12, to_row, to_col].any()
+
+    planes[idx, from_row, from_col] = 0.0
+    planes[:12, to_row, to_col] = 0.0
+    if move.promotion:
+        idx = PIECE_PLANES[(move.promotion, color)]
+    planes[idx, to_row, to_col] = 1.0
+
+    piece_type = idx % 6 + 1
+    if piece_type == chess.PAWN and from_col != to_col and not is_capture:
+        # En passant: the captured pawn sits beside the moving pawn
+        planes[:12, from_row, to_col] = 0.0
+    elif piece_type == chess.KING and abs(to_col - from_col) == 2:
+        # Castling: move the rook to the other side of the king
+        rook = PIECE_PLANES[(chess.ROOK, color)]
+        rook_from, rook_to = (7, 5) if to_col > from_col else (0, 3)
+        planes[rook, from_row, rook_from] = 0.0
+        planes[rook, from_row, rook_to] = 1.0
+
+def encode_feature_planes(board, planes):
+    # Everything except the piece planes, which depend on more than the moved squares
+    planes[12:] = 0.0
 
     # 2) Encode castling rights
     castling_rights = [
@@ -100,36 +159,42 @@ def convert_board_to_tensor(board):
     # 6) Encode repetition count (3-fold)
     planes[20, 0, 0] = 1.0 if board.is_repetition(3) else 0.0
 
-    # 7) Encode squares attacked by white (plane 21) and black (plane 22)
-    for sq in chess.SQUARES:
-        piece = board.piece_at(sq)
-        if piece:
-            attacks = board.attacks(sq)
-            if piece.color == chess.WHITE:
-                for attack_sq in attacks:
-                    r, c = divmod(attack_sq, 8)
-                    planes[21, r, c] = 1.0
-            else:
-                for attack_sq in attacks:
-                    r, c = divmod(attack_sq, 8)
-                    planes[22, r, c] = 1.0
+    # 7) Encode squares attacked by white (plane 21) and black (plane 22); only occupied squares attack anything
+    attack_masks = np.zeros(2, dtype="<u8")
+    for i, color in enumerate((chess.WHITE, chess.BLACK)):
+        attacked = 0
+        for sq in chess.scan_forward(board.occupied_co[color]):
+            attacked |= board.attacks_mask(sq)
+        attack_masks[i] = attacked
+    planes[21:23] = np.unpackbits(attack_masks.view(np.uint8), bitorder="little").reshape(2, 8, 8)
 
     # 8) Encode passed pawns (plane 23 for white, 24 for black)
-    for sq, piece in piece_map.items():
-        if piece.piece_type == chess.PAWN and is_passed_pawn(board, sq):
-            row, col = divmod(sq, 8)
-            if piece.color == chess.WHITE:
-                planes[23, row, col] = 1.0
-            else:
-                planes[24, row, col] = 1.0
-
-    return planes
+    for color, plane in ((chess.WHITE, 23), (chess.BLACK, 24)):
+        for sq in board.pieces(chess.PAWN, color):
+            if is_passed_pawn(board, sq):
+                row, col = divmod(sq, 8)
+                planes[plane, row, col] = 1.0
+
+# The halfmove clock and fullmove number planes hold counts / 100; packed planes keep the counts themselves
+COUNT_PLANES = slice(17, 19)
+COUNT_PLANE_SCALE = 100.0
+
+def pack_board_planes(planes):
+    # Every other plane is 0/1, so each plane row packs into one byte with bit c holding column c;
+    # the count planes only have a value at [0, 0], which is stored whole as a little-endian uint16
+    # in the bytes of their first two rows, so fullmove numbers past 255 survive
+    packed = np.packbits(planes.astype(bool), axis=-1, bitorder="little")[..., 0]
+    counts = np.minimum(np.rint(planes[..., COUNT_PLANES, 0, 0] * COUNT_PLANE_SCALE), 65535).astype(np.uint16)
+    packed[..., COUNT_PLANES, :] = 0
+    packed[..., COUNT_PLANES, 0] = counts & 255
+    packed[..., COUNT_PLANES, 1] = counts >> 8
+    return packed
 
 def is_passed_pawn(board, square):
     file = chess.square_file(square)
     rank = chess.square_rank(square)
     color = board.color_at(square)
-    if not color:
+    if color is None:
         return False  # No piece at this square
 
     # Get all enemy pawns
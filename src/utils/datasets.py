@@ -1,6 +1,10 @@
 import torch
 import h5py
+# Importing it registers the Blosc2 filter that data preparation compresses with
+import hdf5plugin
+import numpy as np
 from torch.utils.data import Dataset
+from src.utils.chess_utils import BOARD_ENCODING_VERSION
 
 class H5Dataset(Dataset):
     def __init__(self, h5_file_path, indices):
@@ -9,6 +13,10 @@ class H5Dataset(Dataset):
         self.h5_file = None
 
         with h5py.File(self.h5_file_path, 'r') as f:
+            # Datasets written before the version was recorded use version 1
+            encoding_version = int(f.attrs.get('board_encoding_version', 1))
+            if encoding_version != BOARD_ENCODING_VERSION:
+                raise ValueError(f"{self.h5_file_path} uses board encoding version {encoding_version}, but inputs are now encoded with version {BOARD_ENCODING_VERSION}. Regenerate the dataset.")
             self.input_shape = f['inputs'].shape[1:]
             self.policy_shape = f['policy_targets'].shape[1:] if len(f['policy_targets'].shape) > 1 else ()
             self.value_shape = f['value_targets'].shape[1:] if len(f['value_targets'].shape) > 1 else ()
@@ -22,7 +30,7 @@ class H5Dataset(Dataset):
             self.h5_file = h5py.File(self.h5_file_path, 'r')
 
         try:
-            actual_idx = self.indices[idx]
+            actual_idx = int(self.indices[idx])
             inp = self.h5_file['inputs'][actual_idx]
             pol = self.h5_file['policy_targets'][actual_idx]
             val = self.h5_file['value_targets'][actual_idx]
@@ -35,9 +43,9 @@ class H5Dataset(Dataset):
             if val.shape != self.value_shape:
                 raise ValueError(f"Value target shape mismatch at index {actual_idx}: {val.shape} != {self.value_shape}")
 
-            # Convert data to tensors
-            inp_t = torch.from_numpy(inp).float()
-            pol_t = torch.tensor(pol).long()
+            # Convert data to tensors; packed uint8 inputs are widened on the device by the training loop
+            inp_t = torch.from_numpy(inp)
+            pol_t = torch.tensor(pol.astype(np.int64))
             val_t = torch.tensor(val).float()
             return inp_t, pol_t, val_t
         except Exception as e:
@@ -0,0 +1,108 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Tuple
+import numpy as np
+import torch
+
+class InferenceServer:
+    MAX_BATCH = 32
+    WAIT_MS = 2
+
+    def __init__(self, model, device, max_batch: int = MAX_BATCH, wait_ms: float = WAIT_MS):
+        self.model = model
+        self.device = device
+        self.dtype = next(model.parameters()).dtype
+        self.max_batch = max_batch
+        self.wait_s = wait_ms / 1000.0
+        self.requests = queue.Queue()
+        self.thread = None
+
+        # Persistent pinned staging buffers for asynchronous host-to-device copies
+        self.use_cuda = torch.device(device).type == "cuda"
+        self.pinned = None
+        self.device_buffer = None
+        if self.use_cuda:
+            self.copy_stream = torch.cuda.Stream(device=device)
+            self.copy_done = torch.cuda.Event()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._serve, name="InferenceServer", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, board_tensor: np.ndarray) -> Future:
+        future = Future()
+        self.requests.put((board_tensor, future))
+        return future
+
+    def infer(self, board_tensor: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
+        return self.submit(board_tensor).result()
+
+    def _serve(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+
+            # Collect more requests until the batch is full or the wait window closes
+            batch = [request]
+            stopping = False
+            deadline = time.monotonic() + self.wait_s
+            while len(batch) < self.max_batch:
+                try:
+                    request = self.requests.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._run_batch(batch)
+            if stopping:
+                break
+
+    def _run_batch(self, batch):
+        arrays, futures = zip(*batch)
+        try:
+            inputs = self._stage_inputs(arrays)
+            with torch.inference_mode():
+                policy_logits, value_out = self.model(inputs)
+                policy_logits, value_out = policy_logits.float(), value_out.float()
+
+            # Hand each caller its own row of the batched output
+            for i, future in enumerate(futures):
+                future.set_result((policy_logits[i], value_out[i]))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _stage_inputs(self, arrays) -> torch.Tensor:
+        if not self.use_cuda:
+            return torch.from_numpy(np.stack(arrays)).to(self.device, dtype=self.dtype)
+
+        if self.pinned is None:
+            self.pinned = torch.empty((self.max_batch, *arrays[0].shape), dtype=self.dtype, pin_memory=True)
+            self.device_buffer = torch.empty_like(self.pinned, device=self.device).contiguous(memory_format=torch.channels_last)
+
+        n = len(arrays)
+        # The previous copy must finish before the pinned buffer is refilled
+        self.copy_done.synchronize()
+        np.stack(arrays, out=self.pinned.numpy()[:n])
+
+        # The previous forward must finish reading the device buffer before it is overwritten
+        self.copy_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(self.copy_stream):
+            self.device_buffer[:n].copy_(self.pinned[:n], non_blocking=True)
+            self.copy_done.record()
+        torch.cuda.current_stream().wait_stream(self.copy_stream)
+        return self.device_buffer[:n]
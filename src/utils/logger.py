@@ -3,6 +3,14 @@ import traceback
 import threading
 from PyQt5.QtCore import QObject, pyqtSignal
 
+class QueueLogSignal:
+    # Stands in for a Qt signal in pool processes, whose parent forwards the queued logs to the UI
+    def __init__(self, log_queue):
+        self.log_queue = log_queue
+
+    def emit(self, level, message):
+        self.log_queue.put((level, message))
+
 class Logger(QObject):
     # Signals
     log_signal = pyqtSignal(str, str)
@@ -1,10 +1,12 @@
 import time
 import random
+from contextlib import contextmanager
 import numpy as np
 import torch
 import torch.optim as optim
 from torch.nn import functional as F
 from torch.amp import autocast
+from src.utils.chess_utils import COUNT_PLANES, COUNT_PLANE_SCALE
 from src.utils.common_utils import format_time_left, wait_if_paused
 
 def initialize_random_seeds(random_seed: int) -> None:
@@ -19,6 +21,17 @@ def initialize_random_seeds(random_seed: int) -> None:
     torch.backends.cudnn.deterministic = True
     torch.backends.cudnn.benchmark = False
 
+@contextmanager
+def preserve_backend_flags():
+    # Backend flags are process-wide, so flags tuned for one run are put back before the next one (e.g. deterministic training)
+    cudnn = torch.backends.cudnn
+    saved = (cudnn.benchmark, cudnn.deterministic, cudnn.allow_tf32, torch.get_float32_matmul_precision())
+    try:
+        yield
+    finally:
+        cudnn.benchmark, cudnn.deterministic, cudnn.allow_tf32 = saved[:3]
+        torch.set_float32_matmul_precision(saved[3])
+
 def initialize_optimizer(model: torch.nn.Module, optimizer_type: str, learning_rate: float, weight_decay: float, logger=None) -> optim.Optimizer:
     optimizer_type = optimizer_type.lower()
 
@@ -52,6 +65,56 @@ def initialize_scheduler(optimizer: optim.Optimizer, scheduler_type: str, total_
         logger.error(f"Unsupported scheduler type '{scheduler_type}'.")
     return scheduler
 
+def decode_board_planes(inputs: torch.Tensor) -> torch.Tensor:
+    # Packed uint8 positions are widened after the copy, so only a fraction of the bytes cross to the device
+    if inputs.dtype != torch.uint8:
+        return inputs
+    if inputs.dim() == 3:
+        # Bit-packed rows: bit c of each byte is column c, except the count planes whose first two bytes are the count
+        shifts = torch.arange(8, dtype=torch.uint8, device=inputs.device)
+        planes = ((inputs.unsqueeze(-1) >> shifts) & 1).float()
+        counts = inputs[:, COUNT_PLANES, 0].float() + inputs[:, COUNT_PLANES, 1].float() * 256.0
+        planes[:, COUNT_PLANES] = 0.0
+        planes[:, COUNT_PLANES, 0, 0] = counts / COUNT_PLANE_SCALE
+        return planes
+    inputs = inputs.float()
+    inputs[:, COUNT_PLANES] /= COUNT_PLANE_SCALE
+    return inputs
+
+class CUDAPrefetcher:
+    # Moves the next batch's inputs to the device on a side stream while the current batch runs; on CPU it just moves them
+    def __init__(self, loader, device: torch.device):
+        self.loader = iter(loader)
+        self.device = device
+        self.stream = torch.cuda.Stream(device=device) if device.type == 'cuda' else None
+        self.next_batch = None
+        self._preload()
+
+    def _preload(self):
+        try:
+            inputs, *rest = next(self.loader)
+        except StopIteration:
+            self.next_batch = None
+            return
+        with torch.cuda.stream(self.stream):
+            inputs = decode_board_planes(inputs.to(self.device, non_blocking=True))
+        self.next_batch = (inputs, *rest)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.next_batch is None:
+            raise StopIteration
+        batch = self.next_batch
+        if self.stream is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(self.stream)
+            # The inputs were allocated on the side stream but are consumed on the current one
+            batch[0].record_stream(current_stream)
+        self._preload()
+        return batch
+
 def compute_policy_loss(predicted_policies: torch.Tensor, target_policies: torch.Tensor, apply_smoothing: bool = True) -> torch.Tensor:
     if apply_smoothing:
         one_hot = torch.zeros_like(predicted_policies)
@@ -112,7 +175,7 @@ def train_epoch( model, data_loader,  device, scaler, optimizer, scheduler=None,
             wait_if_paused(is_paused_event)
 
         # Move data to device
-        inputs = inputs.to(device, non_blocking=True)
+        inputs = decode_board_planes(inputs.to(device, non_blocking=True))
         policy_targets = policy_targets.to(device, non_blocking=True)
         value_targets = value_targets.to(device, non_blocking=True)
 
@@ -228,7 +291,7 @@ def validate_epoch(model, val_loader, device, epoch: int, training_accuracy: flo
                 if is_paused_event:
                     wait_if_paused(is_paused_event)
 
-                inputs = inputs.to(device, non_blocking=True)
+                inputs = decode_board_planes(inputs.to(device, non_blocking=True))
                 policy_targets = policy_targets.to(device, non_blocking=True)
                 value_targets = value_targets.to(device, non_blocking=True)
 
@@ -0,0 +1,66 @@
+import random
+import chess
+import numpy as np
+from src.utils.chess_utils import convert_board_to_tensor, encode_feature_planes, flip_board_tensor, flip_move, get_move_mapping, pack_board_planes, update_piece_planes
+
+def random_positions(num_games=40, seed=0):
+    rng = random.Random(seed)
+    for _ in range(num_games):
+        board = chess.Board()
+        for _ in range(rng.randint(1, 160)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            yield board
+
+def test_flip_board_tensor_matches_mirrored_board():
+    for board in random_positions():
+        expected = convert_board_to_tensor(board.mirror())
+        np.testing.assert_array_equal(flip_board_tensor(convert_board_to_tensor(board)), expected, err_msg=board.fen())
+
+def test_flip_board_tensor_drops_repetition():
+    board = chess.Board()
+    for _ in range(2):
+        for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+            board.push_uci(uci)
+    assert convert_board_to_tensor(board)[20, 0, 0] == 1.0
+    np.testing.assert_array_equal(flip_board_tensor(convert_board_to_tensor(board)), convert_board_to_tensor(board.mirror()))
+
+def test_black_passed_pawns_are_encoded():
+    board = chess.Board("4k3/8/8/8/3p4/8/6P1/4K3 w - - 0 1")
+    planes = convert_board_to_tensor(board)
+    assert planes[24, 3, 3] == 1.0
+    assert planes[23, 1, 6] == 1.0
+    # A white pawn on an adjacent file below it blocks the pawn
+    board = chess.Board("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1")
+    assert not convert_board_to_tensor(board)[24].any()
+
+def test_incremental_mirrored_samples_match_mirrored_board():
+    # Mirrors how data preparation builds its augmented samples from incrementally updated planes
+    move_mapping = get_move_mapping()
+    rng = random.Random(1)
+    for _ in range(20):
+        board = chess.Board()
+        planes = convert_board_to_tensor(board)
+        for _ in range(rng.randint(1, 160)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            encode_feature_planes(board, planes)
+            np.testing.assert_array_equal(flip_board_tensor(planes), convert_board_to_tensor(board.mirror()), err_msg=board.fen())
+            flipped_idx = move_mapping.MIRROR_INDEX[move_mapping.get_index_by_move(move)]
+            assert move_mapping.get_move_by_index(int(flipped_idx)) == flip_move(move)
+            update_piece_planes(planes, move)
+            board.push(move)
+
+def test_pack_board_planes_keeps_large_move_counts():
+    board = chess.Board("4k3/8/8/8/8/8/8/4K3 w - - 87 1234")
+    planes = convert_board_to_tensor(board)
+    packed = pack_board_planes(planes[None])[0]
+    counts = packed[17:19, 0].astype(np.int64) + packed[17:19, 1].astype(np.int64) * 256
+    np.testing.assert_array_equal(counts, [87, 1234])
+    # Every other plane round-trips through its bits
+    unpacked = np.unpackbits(packed[..., None], axis=-1, bitorder="little").astype(np.float32)
+    np.testing.assert_array_equal(np.delete(unpacked, [17, 18], axis=0), np.delete(planes, [17, 18], axis=0))